@@ -598,8 +598,9 @@ app.get('/api/disputes/:id', authMiddleware, (req, res) => {
 app.get('/api/disputes', authMiddleware, (req, res) => {
   const auth = (req as any).authWallet as { id: string }
   const status = typeof req.query.status === 'string' ? req.query.status : undefined
+  const paymentId = typeof req.query.paymentId === 'string' ? req.query.paymentId : undefined
   
-  const disputesList = disputes.listByWallet(auth.id, status as any)
+  const disputesList = disputes.listByWallet(auth.id, status as any, paymentId)
   res.json({ ok: true, disputes: disputesList })
 })
 
@@ -150,7 +150,7 @@ export class DisputeManager {
   /**
    * List disputes filtered by wallet
    */
-  listByWallet(walletId: string, status?: Dispute['status']): Dispute[] {
+  listByWallet(walletId: string, status?: Dispute['status'], paymentId?: string): Dispute[] {
     const db = getDb()
     
     let query = 'SELECT * FROM disputes WHERE (buyerWalletId = ? OR providerWalletId = ?)'
@@ -161,6 +161,11 @@ export class DisputeManager {
       params.push(status)
     }
 
+    if (paymentId) {
+      query += ' AND paymentId = ?'
+      params.push(paymentId)
+    }
+
     query += ' ORDER BY createdAt DESC'
 
     return db.prepare(query).all(...params) as Dispute[]
@@ -35,11 +35,14 @@ Example:
     >>> print(result.output)
 """
 
-from .client import AgentPayClient
+from importlib.util import find_spec
+from typing import TYPE_CHECKING
+
 from .types import (
     AgentWallet,
     Service,
     Payment,
+    ExecutionRequest,
     ExecutionResult,
     ExecutionReceipt,
     Dispute,
@@ -59,9 +62,14 @@ from .exceptions import (
     PaymentError,
     DisputeError,
     WebhookError,
-    ExecutionError
+    ExecutionError,
+    BatchExecutionError
 )
 
+if TYPE_CHECKING:
+    from .client import AgentPayClient
+    from .async_client import AsyncAgentPayClient
+
 __version__ = "0.2.0"
 __author__ = "AgentsPay"
 __license__ = "MIT"
@@ -69,11 +77,13 @@ __license__ = "MIT"
 __all__ = [
     # Main client
     "AgentPayClient",
+    "AsyncAgentPayClient",
     
     # Types
     "AgentWallet",
     "Service",
     "Payment",
+    "ExecutionRequest",
     "ExecutionResult",
     "ExecutionReceipt",
     "Dispute",
@@ -94,4 +104,28 @@ __all__ = [
     "DisputeError",
     "WebhookError",
     "ExecutionError",
+    "BatchExecutionError",
 ]
+
+# Keep `from agentspay import *` working without the optional "async" extra
+if find_spec("httpx") is None:
+    __all__.remove("AsyncAgentPayClient")
+
+
+def __getattr__(name):
+    # The clients pull in requests (and httpx for the async one, an optional
+    # extra), so importing types or exceptions alone stays cheap
+    if name == "AgentPayClient":
+        from .client import AgentPayClient
+        return AgentPayClient
+    if name == "AsyncAgentPayClient":
+        try:
+            from .async_client import AsyncAgentPayClient
+        except ModuleNotFoundError as e:
+            if e.name != "httpx":
+                raise
+            raise ImportError(
+                "AsyncAgentPayClient requires httpx: pip install agentspay[async]"
+            ) from e
+        return AsyncAgentPayClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
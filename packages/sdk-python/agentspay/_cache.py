@@ -0,0 +1,98 @@
+"""In-process TTL cache for AgentPay SDK"""
+
+import functools
+import sys
+import threading
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Callable, Hashable, Optional, TypeVar, cast
+
+if sys.version_info >= (3, 10):
+    from typing import Concatenate, ParamSpec
+else:
+    from typing_extensions import Concatenate, ParamSpec
+
+
+MISSING = object()
+
+
+class TTLCache:
+    """
+    Small thread-safe TTL + LRU cache
+
+    Entries expire ``default_ttl`` seconds after they are stored; when the
+    cache is full the least recently used entry is evicted.
+    """
+
+    def __init__(self, default_ttl: float = 30.0, max_size: int = 512):
+        self.default_ttl = default_ttl
+        self.max_size = max_size
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        """Return the cached value for ``key``, or ``default`` if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if monotonic() >= expires_at:
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store ``value`` under ``key`` for ``ttl`` seconds (defaults to ``default_ttl``)"""
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        with self._lock:
+            if key in self._data:
+                del self._data[key]
+            elif len(self._data) >= self.max_size:
+                self._data.popitem(last=False)
+            self._data[key] = (monotonic() + ttl, value)
+
+    def delete(self, key: Hashable) -> None:
+        """Drop ``key`` from the cache if present"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+P = ParamSpec("P")
+K = TypeVar("K", bound=Hashable)
+R = TypeVar("R")
+_Method = Callable[Concatenate[Any, K, P], R]
+
+
+def cached(
+    kind: str, ttl: Optional[float] = None
+) -> Callable[[_Method[K, P, R]], _Method[K, P, R]]:
+    """
+    Cache a method's result in ``self._cache`` keyed by ``(kind, first_arg)``
+
+    Args:
+        kind: Resource kind used as the first half of the cache key
+        ttl: Entry lifetime in seconds (defaults to the cache's ``default_ttl``)
+    """
+    def decorator(fn: _Method[K, P, R]) -> _Method[K, P, R]:
+        @functools.wraps(fn)
+        def wrapper(self: Any, resource_id: K, *args: P.args, **kwargs: P.kwargs) -> R:
+            key = (kind, resource_id)
+            value = self._cache.get(key)
+            if value is MISSING:
+                value = fn(self, resource_id, *args, **kwargs)
+                self._cache.set(key, value, ttl)
+            return cast(R, value)
+        return wrapper
+    return decorator
@@ -0,0 +1,63 @@
+"""Import-time generation of API response parsers"""
+
+import dataclasses
+from typing import Any, Callable, Dict, Iterable, Optional, Type, TypeVar, cast
+
+T = TypeVar("T")
+
+
+def make_parser(
+    cls: Type[T],
+    key_map: Dict[str, str],
+    optional: Iterable[str] = (),
+    doc: str = "",
+    defaults: Optional[Dict[str, Any]] = None
+) -> Callable[[dict], T]:
+    """
+    Generate a specialized ``dict -> cls`` parser for a dataclass
+
+    The generated function passes every field positionally, in dataclass
+    field order, which is markedly cheaper than keyword construction when
+    parsing large result lists. Building it from ``dataclasses.fields``
+    keeps it correct if fields are reordered.
+
+    Args:
+        cls: Dataclass to construct
+        key_map: Dataclass field name -> JSON key, covering every field
+        optional: Field names read with ``dict.get`` (None when absent)
+        doc: Docstring for the generated function
+        defaults: Field name -> value used when the JSON key is absent
+
+    Returns:
+        Callable[[dict], cls]: The parser
+
+    Raises:
+        ValueError: If ``key_map`` does not match the dataclass fields
+    """
+    names = [f.name for f in dataclasses.fields(cls)]  # type: ignore[arg-type]
+    optional = set(optional)
+    defaults = defaults or {}
+    if set(key_map) != set(names) or not (optional | set(defaults)) <= set(names):
+        raise ValueError(f"Key map does not match the fields of {cls.__name__}")
+
+    # Defaults are bound as globals of the generated function, not inlined
+    env: Dict[str, Any] = {"cls": cls}
+
+    def arg(name: str) -> str:
+        key = key_map[name]
+        if name in defaults:
+            env[f"_default_{name}"] = defaults[name]
+            return f"get({key!r}, _default_{name})"
+        if name in optional:
+            return f"get({key!r})"
+        return f"data[{key!r}]"
+
+    args = ", ".join(arg(name) for name in names)
+    func_name = f"_parse_{cls.__name__}"
+    source = f"def {func_name}(data):\n    get = data.get\n    return cls({args})\n"
+
+    namespace: Dict[str, Any] = {}
+    exec(source, env, namespace)
+    parser = namespace[func_name]
+    parser.__doc__ = doc
+    return cast(Callable[[dict], T], parser)
@@ -0,0 +1,79 @@
+"""Process-wide DNS cache for AgentPay SDK connections"""
+
+import socket
+from typing import Any
+from urllib.parse import urlparse
+
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from ._cache import MISSING, TTLCache
+
+
+# host, port -> resolved IP address
+_DNS_CACHE = TTLCache(default_ttl=300.0, max_size=64)
+
+
+def resolve(host: str, port: int) -> str:
+    """Resolve ``host`` to an IP address, reusing a recent answer when possible"""
+    key = (host, port)
+    address = _DNS_CACHE.get(key)
+    if address is MISSING:
+        info = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        address = info[0][4][0]
+        _DNS_CACHE.set(key, address)
+    return address
+
+
+def warm(url: str) -> None:
+    """Resolve the host of ``url`` ahead of the first connection"""
+    parts = urlparse(url)
+    if parts.hostname:
+        resolve(parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+
+
+class _CachedDNSMixin:
+    """Connect to the cached address of the host; TLS still verifies the hostname"""
+
+    _dns_host: str
+    port: int
+
+    def _new_conn(self) -> socket.socket:
+        host = self._dns_host
+        try:
+            self._dns_host = resolve(host, self.port)
+        except OSError:
+            pass  # let urllib3 resolve it and report the failure its own way
+        try:
+            return super()._new_conn()  # type: ignore[misc]
+        except Exception:
+            # The cached address may have gone stale; resolve afresh on retry
+            _DNS_CACHE.delete((host, self.port))
+            raise
+        finally:
+            self._dns_host = host
+
+
+class _CachedDNSConnection(_CachedDNSMixin, HTTPConnection):
+    pass
+
+
+class _CachedDNSHTTPSConnection(_CachedDNSMixin, HTTPSConnection):
+    pass
+
+
+class _CachedDNSPool(HTTPConnectionPool):
+    ConnectionCls = _CachedDNSConnection
+
+
+class _CachedDNSHTTPSPool(HTTPSConnectionPool):
+    ConnectionCls = _CachedDNSHTTPSConnection
+
+
+def enable_dns_cache(adapter: Any) -> Any:
+    """Make a requests HTTPAdapter open new connections via the DNS cache"""
+    adapter.poolmanager.pool_classes_by_scheme = {
+        "http": _CachedDNSPool,
+        "https": _CachedDNSHTTPSPool,
+    }
+    return adapter
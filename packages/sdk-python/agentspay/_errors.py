@@ -0,0 +1,41 @@
+"""Error translation helpers for AgentPay SDK"""
+
+import functools
+import sys
+from typing import Callable, Type, TypeVar
+
+import requests
+
+from .exceptions import AgentPayError
+
+if sys.version_info >= (3, 10):
+    from typing import ParamSpec
+else:
+    from typing_extensions import ParamSpec
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+def wrap(err_cls: Type[AgentPayError], msg: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """
+    Re-raise transport errors from the decorated method as ``err_cls``
+
+    The message ``"<msg>: <error>"`` is only formatted when a
+    requests.RequestException actually propagates, so the success path
+    carries no error-handling code. SDK errors raised inside the method
+    (e.g. "not found") pass through unchanged.
+
+    Args:
+        err_cls: AgentPayError subclass to raise
+        msg: Message prefix, e.g. "Failed to get wallet"
+    """
+    def decorator(fn: Callable[P, R]) -> Callable[P, R]:
+        @functools.wraps(fn)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            try:
+                return fn(*args, **kwargs)
+            except requests.RequestException as e:
+                raise err_cls(f"{msg}: {e}") from e
+        return wrapper
+    return decorator
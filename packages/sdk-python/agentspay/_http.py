@@ -0,0 +1,370 @@
+"""HTTP transport helpers for AgentPay SDK"""
+
+import json
+import math
+import socket
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.exceptions import InvalidHeader
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+from ._dns import enable_dns_cache
+
+if TYPE_CHECKING:
+    import httpx
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    # Same settings requests uses for json=, and the same error on failure,
+    # so the SDK's error wrapping still applies
+    try:
+        return json.dumps(obj, allow_nan=False).encode("utf-8")
+    except (TypeError, ValueError) as e:
+        raise requests.exceptions.InvalidJSONError(f"Cannot serialize request body: {e}") from e
+
+
+def _has_non_finite(obj: Any) -> bool:
+    """Check for NaN/Infinity anywhere in a JSON-able value"""
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_non_finite(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_non_finite(v) for v in obj)
+    return False
+
+
+try:  # optional C-accelerated JSON ("fast" extra)
+    import orjson
+    json_loads = orjson.loads
+
+    def json_dumps(obj: Any) -> bytes:
+        try:
+            body = orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits, which the stdlib encoder handles
+            return _stdlib_dumps(obj)
+        if b"null" in body and _has_non_finite(obj):
+            # orjson writes NaN/Infinity as null; have the stdlib encoder reject them
+            return _stdlib_dumps(obj)
+        return body
+except ImportError:
+    json_loads = json.loads
+    json_dumps = _stdlib_dumps
+
+
+class _RateLimitRetry(Retry):
+    """Retry that also replays non-idempotent requests rejected with 429"""
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        # The API's rate limiter answers before any route handler runs, so a
+        # 429'd POST was never processed and is safe to send again
+        if status_code == 429:
+            return bool(self.total)
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+def _retry_policy(max_retries: int = 3) -> Retry:
+    """
+    Retry transient failures inside urllib3, on the warm pooled connection
+
+    Connection failures and 429 replies are retried for every method because
+    the request never reached (or was turned away by) the server, honouring
+    Retry-After. Read errors and 5xx replies are only retried for idempotent
+    methods (GET, PUT, DELETE, ...): the API has no idempotency keys, so
+    replaying POST /api/execute could charge twice.
+    """
+    return _RateLimitRetry(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        backoff_factor=0.25,
+        status_forcelist=(429, 502, 503, 504),
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+
+
+def _keepalive_socket_options(
+    idle: int = 60,
+    interval: int = 20,
+    count: int = 5
+) -> List[Tuple[int, int, int]]:
+    """
+    TCP keepalive probing for pooled sockets
+
+    A client that sits idle between webhook events keeps its pooled
+    connections alive through NAT and firewall idle timeouts, so the next
+    call does not pay a fresh TCP/TLS handshake. Options the platform lacks
+    are skipped.
+    """
+    options = list(HTTPConnection.default_socket_options)
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    # TCP_KEEPALIVE is the macOS spelling of the idle time
+    tcp_idle = getattr(socket, "TCP_KEEPIDLE", getattr(socket, "TCP_KEEPALIVE", None))
+    for name, value in ((tcp_idle, idle),
+                        (getattr(socket, "TCP_KEEPINTVL", None), interval),
+                        (getattr(socket, "TCP_KEEPCNT", None), count)):
+        if name is not None:
+            options.append((socket.IPPROTO_TCP, name, value))
+    return options
+
+
+def default_headers(api_key: Optional[str] = None) -> dict:
+    """Build the headers sent with every AgentPay API request"""
+    headers = {"Content-Type": "application/json"}
+    set_auth_header(headers, api_key)
+    return headers
+
+
+def set_auth_header(headers: Any, api_key: Optional[str]) -> None:
+    """Set (or with no key, remove) the Authorization header in place"""
+    if api_key:
+        headers["Authorization"] = f"Bearer {api_key}"
+    elif "Authorization" in headers:
+        del headers["Authorization"]
+
+
+DEFAULT_POOL_SIZE = 32
+
+
+def _cache_adapter(http_cache: Union[bool, str], **adapter_kwargs: Any) -> HTTPAdapter:
+    """
+    Build a hishel adapter that caches GET responses per RFC 9111
+
+    ``Cache-Control`` freshness is honoured, and stale entries carrying an
+    ``ETag``/``Last-Modified`` are revalidated with a conditional GET, so an
+    unchanged resource costs a 304 instead of the full body. The cache is
+    private (one API key), so authenticated responses may be stored.
+    """
+    try:
+        import hishel
+        from hishel.requests import CacheAdapter
+    except ImportError as e:
+        raise ImportError(
+            "HTTP caching requires hishel: pip install agentspay[cache]"
+        ) from e
+
+    class _RevalidatingCacheAdapter(CacheAdapter):
+        def build_response(self, req: Any, resp: Any) -> requests.Response:
+            response = super().build_response(req, resp)
+            if response.status_code == 304:
+                # hishel merges the 304's headers over the stored response; a
+                # "Content-Length: 0" there (Express, many proxies) would then
+                # make the cached body look truncated and fail with IncompleteRead
+                response.headers.pop("Content-Length", None)
+            return response
+
+    if isinstance(http_cache, str):
+        storage = hishel.SyncSqliteStorage(database_path=http_cache)
+    else:
+        import sqlite3
+        # Shared by every pool thread: SyncSqliteStorage serialises all access
+        # to its connection behind its own lock (hishel>=1.4)
+        storage = hishel.SyncSqliteStorage(
+            connection=sqlite3.connect(":memory:", check_same_thread=False)
+        )
+
+    policy = hishel.SpecificationPolicy(cache_options=hishel.CacheOptions(shared=False))
+    return _RevalidatingCacheAdapter(storage=storage, policy=policy, **adapter_kwargs)
+
+
+def create_session(
+    api_key: Optional[str] = None,
+    http2: bool = False,
+    max_pool_size: int = DEFAULT_POOL_SIZE,
+    http_cache: Union[bool, str] = False,
+    cache_dns: bool = False,
+    max_retries: int = 3
+) -> "HTTPSession":
+    """
+    Create a pooled HTTP session for talking to the AgentPay API
+
+    The session keeps connections alive between calls, so back-to-back
+    requests to the same host skip the TCP and TLS handshakes.
+
+    Args:
+        api_key: Optional API key sent as a Bearer token on every request
+        http2: Use an httpx-backed HTTP/2 session instead of requests
+        max_pool_size: Keep-alive connections kept open to the API host; size
+            it to the number of threads calling the client concurrently
+        http_cache: Cache GET responses per RFC 9111 (requires the ``cache``
+            extra); True keeps them in memory, a path stores them in SQLite
+        cache_dns: Reuse resolved API addresses for 5 minutes when opening
+            new connections instead of resolving each time
+        max_retries: Retries for transient failures (0 disables)
+
+    Returns:
+        Session with default headers and retrying adapters
+    """
+    session: HTTPSession
+    if http2:
+        if http_cache or cache_dns:
+            raise ValueError("http_cache and cache_dns are not supported together with http2")
+        session = HttpxSession(max_pool_size, max_retries)
+    else:
+        session = requests.Session()
+
+        # The SDK talks to a single host, so a few host pools suffice; pool_maxsize
+        # bounds the sockets kept per host. pool_block=False lets bursts beyond it
+        # open (and then drop) extra connections instead of waiting.
+        adapter_kwargs: Dict[str, Any] = dict(
+            pool_connections=4,
+            pool_maxsize=max_pool_size,
+            pool_block=False,
+            max_retries=_retry_policy(max_retries)
+        )
+        if http_cache:
+            adapter = _cache_adapter(http_cache, **adapter_kwargs)
+        else:
+            adapter = HTTPAdapter(**adapter_kwargs)
+        if cache_dns:
+            enable_dns_cache(adapter)
+        # Keep idle pooled sockets from being reaped by NAT between calls
+        adapter.poolmanager.connection_pool_kw["socket_options"] = _keepalive_socket_options()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        # Every codec urllib3 can decode here: gzip/deflate, plus br and zstd when
+        # brotli/zstandard are installed (the "fast" extra adds brotli)
+        session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+
+    # Set once here; individual calls never pass headers=
+    session.headers.update(default_headers(api_key))
+
+    return session
+
+
+class HttpxResponse:
+    """requests.Response look-alike wrapping an httpx.Response"""
+
+    def __init__(self, response: "httpx.Response"):
+        self._response = response
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._response, name)
+
+    @property
+    def ok(self) -> bool:
+        return not self._response.is_error
+
+    def json(self) -> Any:
+        return decode_json(self)
+
+    def raise_for_status(self) -> None:
+        """Raise requests.HTTPError for 4xx/5xx responses"""
+        if self._response.is_error:
+            raise requests.HTTPError(
+                f"{self.status_code} Error for url: {self._response.url}",
+                response=self  # type: ignore[arg-type]
+            )
+
+
+class HttpxSession:
+    """
+    requests.Session look-alike backed by httpx.Client with HTTP/2
+
+    Concurrent calls are multiplexed over a single connection. Transport
+    errors are re-raised as requests exceptions, so callers handle both
+    session kinds the same way. ``max_retries`` follows the requests
+    session's policy: httpx re-attempts failed connections, and 429 and
+    502/503/504 replies are retried here with the same backoff and
+    Retry-After handling. Requires the ``http2`` extra.
+    """
+
+    def __init__(self, max_pool_size: int = DEFAULT_POOL_SIZE, max_retries: int = 3):
+        try:
+            import httpx
+        except ImportError as e:
+            raise ImportError(
+                "HTTP/2 support requires httpx: pip install agentspay[http2]"
+            ) from e
+
+        self._httpx = httpx
+        # httpx.Client ignores http2= and limits= when given a transport,
+        # so both are set on the transport itself
+        self._client = httpx.Client(
+            transport=httpx.HTTPTransport(
+                http2=True,
+                retries=max_retries,
+                limits=httpx.Limits(max_keepalive_connections=max_pool_size, max_connections=100)
+            ),
+            # httpx defaults to 5s overall; executions can legitimately run longer
+            timeout=httpx.Timeout(30.0, connect=5.0)
+        )
+        self.headers = self._client.headers
+        self._max_retries = max_retries
+        self._retry = _retry_policy(max_retries)
+
+    def request(self, method: str, url: str, **kwargs: Any) -> HttpxResponse:
+        """Send a request, translating httpx errors into requests exceptions"""
+        kwargs.pop("stream", None)  # bodies are read eagerly; there is no .raw
+        if isinstance(kwargs.get("data"), bytes):
+            kwargs["content"] = kwargs.pop("data")
+        attempt = 0
+        while True:
+            try:
+                response = self._client.request(method, url, **kwargs)
+            except self._httpx.TimeoutException as e:
+                raise requests.Timeout(str(e)) from e
+            except self._httpx.HTTPError as e:
+                raise requests.ConnectionError(str(e)) from e
+
+            retry_after = response.headers.get("Retry-After")
+            if attempt >= self._max_retries or not self._retry.is_retry(
+                method.upper(), response.status_code, retry_after is not None
+            ):
+                return HttpxResponse(response)
+            # Same schedule as urllib3: Retry-After when given, else 0, 0.5s, 1s, ...
+            try:
+                delay = self._retry.parse_retry_after(retry_after) if retry_after else None
+            except InvalidHeader:
+                delay = None
+            if delay is None:
+                delay = self._retry.backoff_factor * 2 ** attempt if attempt else 0.0
+            response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def get(self, url: str, **kwargs: Any) -> HttpxResponse:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> HttpxResponse:
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs: Any) -> HttpxResponse:
+        return self.request("PUT", url, **kwargs)
+
+    def patch(self, url: str, **kwargs: Any) -> HttpxResponse:
+        return self.request("PATCH", url, **kwargs)
+
+    def delete(self, url: str, **kwargs: Any) -> HttpxResponse:
+        return self.request("DELETE", url, **kwargs)
+
+    def close(self) -> None:
+        self._client.close()
+
+
+#: Either session kind create_session() returns; both expose the requests API
+HTTPSession = Union[requests.Session, HttpxSession]
+#: Responses returned by an HTTPSession
+HTTPResponse = Union[requests.Response, HttpxResponse]
+
+
+def decode_json(response: Union[HTTPResponse, "httpx.Response"]) -> Any:
+    """
+    Decode a JSON response body, using orjson when it is installed
+
+    Raises:
+        requests.exceptions.InvalidJSONError: If the body is not valid JSON
+    """
+    try:
+        return json_loads(response.content)
+    except ValueError as e:
+        raise requests.exceptions.InvalidJSONError(
+            f"Invalid JSON response: {e}",
+            response=response  # type: ignore[arg-type]
+        ) from e
@@ -0,0 +1,472 @@
+"""AgentPay SDK Async Client"""
+
+import asyncio
+from typing import Optional, List, Dict, Any, Type
+import httpx
+from requests.exceptions import InvalidJSONError
+from ._http import default_headers, json_dumps, json_loads, set_auth_header
+from .wallet import _parse_wallet, _pick_balance, _wallet_balances
+from .services import _parse_service
+from .payments import _collect_batch, _parse_payment, _parse_receipt, _parse_execution_result
+from .disputes import _parse_dispute
+from .webhooks import _is_missing_route, _parse_webhook
+from .client import _parse_reputation
+from .verify import canonical_json, verify_receipt
+from .types import (
+    AgentWallet,
+    Service,
+    ExecutionRequest,
+    ExecutionResult,
+    ExecutionReceipt,
+    Payment,
+    Dispute,
+    Webhook,
+    ReputationScore
+)
+from .exceptions import (
+    AgentPayError,
+    WalletError,
+    ServiceError,
+    PaymentError,
+    DisputeError,
+    WebhookError,
+    ExecutionError
+)
+
+
+class AsyncAgentPayClient:
+    """
+    Asynchronous AgentPay SDK Client
+
+    Same interface as AgentPayClient, but every call is a coroutine so
+    independent requests can be awaited concurrently with asyncio.gather.
+    Requires the ``async`` extra (``pip install agentspay[async]``).
+
+    Example:
+        >>> async with AsyncAgentPayClient(base_url="http://localhost:3100") as client:
+        ...     services = await client.search_and_fetch("nlp")
+        ...     reputations = await asyncio.gather(
+        ...         *[client.get_reputation(s.agent_id) for s in services]
+        ...     )
+    """
+
+    def __init__(
+        self,
+        base_url: str = "http://localhost:3100",
+        api_key: Optional[str] = None,
+        http2: bool = True
+    ):
+        """
+        Initialize async AgentPay client
+
+        Args:
+            base_url: AgentPay API base URL
+            api_key: Optional API key for authentication
+            http2: Negotiate HTTP/2 so concurrent calls share one connection
+        """
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=default_headers(api_key),
+            http2=http2,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            # httpx defaults to 5s overall; executions can legitimately run longer
+            timeout=httpx.Timeout(30.0, connect=5.0)
+        )
+        # Whether the API serves GET /api/webhooks/{id} (None = not probed yet)
+        self._webhook_direct_get: Optional[bool] = None
+
+    def set_api_key(self, api_key: Optional[str]) -> None:
+        """Switch the API key used for subsequent requests, keeping pooled connections"""
+        self.api_key = api_key
+        set_auth_header(self._client.headers, api_key)
+
+    async def close(self) -> None:
+        """Close the underlying HTTP client and release pooled connections"""
+        await self._client.aclose()
+
+    async def __aenter__(self) -> "AsyncAgentPayClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        error_cls: Type[AgentPayError],
+        message: str,
+        body: Any = None,
+        **kwargs: Any
+    ) -> dict:
+        """Send a request (``body`` is sent as JSON) and return the decoded JSON body"""
+        try:
+            if body is not None:
+                kwargs["content"] = json_dumps(body)
+            response = await self._client.request(method, path, **kwargs)
+            response.raise_for_status()
+            return json_loads(await response.aread())
+        except (httpx.HTTPError, ValueError, InvalidJSONError) as e:
+            raise error_cls(f"{message}: {str(e)}") from e
+
+    # Wallet Operations
+
+    async def create_wallet(self) -> AgentWallet:
+        """Create a new agent wallet"""
+        data = await self._request("POST", "/api/wallets", WalletError, "Failed to create wallet")
+        wallet_data = data.get("wallet")
+        if not wallet_data:
+            raise WalletError("Invalid response: missing wallet data")
+        return _parse_wallet(wallet_data)
+
+    async def get_wallet(self, wallet_id: str) -> AgentWallet:
+        """Get wallet by ID"""
+        data = await self._request(
+            "GET", f"/api/wallets/{wallet_id}", WalletError, "Failed to get wallet"
+        )
+        wallet_data = data.get("wallet")
+        if not wallet_data:
+            raise WalletError(f"Wallet {wallet_id} not found")
+        return _parse_wallet(wallet_data)
+
+    async def get_balance(self, wallet_id: str, currency: str = "BSV") -> int:
+        """Get wallet balance for a specific currency"""
+        return _pick_balance(await self.get_balances(wallet_id), currency)
+
+    async def get_balances(self, wallet_id: str) -> Dict[str, int]:
+        """Get wallet balances for every currency ({"BSV": ..., "MNEE": ...})"""
+        return _wallet_balances(await self.get_wallet(wallet_id))
+
+    # Service Operations
+
+    async def register_service(
+        self,
+        agent_id: str,
+        name: str,
+        description: str,
+        price: int,
+        endpoint: str,
+        category: str = "general",
+        currency: str = "BSV",
+        method: str = "POST",
+        timeout: int = 30,
+        dispute_window: int = 30,
+        input_schema: Optional[dict] = None,
+        output_schema: Optional[dict] = None
+    ) -> Service:
+        """Register a new service"""
+        payload = {
+            "agentId": agent_id,
+            "name": name,
+            "description": description,
+            "category": category,
+            "price": price,
+            "currency": currency.upper(),
+            "endpoint": endpoint,
+            "method": method.upper(),
+            "timeout": timeout,
+            "disputeWindow": dispute_window
+        }
+
+        if input_schema:
+            payload["inputSchema"] = input_schema
+        if output_schema:
+            payload["outputSchema"] = output_schema
+
+        data = await self._request(
+            "POST", "/api/services", ServiceError, "Failed to register service",
+            body=payload
+        )
+        service_data = data.get("service")
+        if not service_data:
+            raise ServiceError("Invalid response: missing service data")
+        return _parse_service(service_data)
+
+    async def search_services(
+        self,
+        keyword: Optional[str] = None,
+        category: Optional[str] = None,
+        max_price: Optional[int] = None,
+        min_rating: Optional[float] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> List[Service]:
+        """Search for services"""
+        params = {}
+        if keyword:
+            params["q"] = keyword
+        if category:
+            params["category"] = category
+        if max_price is not None:
+            params["maxPrice"] = str(max_price)
+        if min_rating is not None:
+            params["minRating"] = str(min_rating)
+        if limit:
+            params["limit"] = str(limit)
+        if offset:
+            params["offset"] = str(offset)
+
+        data = await self._request(
+            "GET", "/api/services", ServiceError, "Failed to search services", params=params
+        )
+        return [_parse_service(s) for s in data.get("services", [])]
+
+    async def get_service(self, service_id: str) -> Service:
+        """Get service by ID"""
+        data = await self._request(
+            "GET", f"/api/services/{service_id}", ServiceError, "Failed to get service"
+        )
+        service_data = data.get("service")
+        if not service_data:
+            raise ServiceError(f"Service {service_id} not found")
+        return _parse_service(service_data)
+
+    async def search_and_fetch(
+        self, keyword: Optional[str] = None, **filters: Any
+    ) -> List[Service]:
+        """
+        Search for services, then fetch every hit concurrently
+
+        Args:
+            keyword: Search keyword
+            **filters: Any other search_services() filter
+
+        Returns:
+            List[Service]: Full service records, in search order
+        """
+        results = await self.search_services(keyword=keyword, **filters)
+        return list(await asyncio.gather(*[self.get_service(s.id) for s in results]))
+
+    # Payment & Execution Operations
+
+    async def execute(
+        self,
+        service_id: str,
+        buyer_wallet_id: str,
+        input_data: Dict[str, Any]
+    ) -> ExecutionResult:
+        """Execute a service and handle payment"""
+        payload = {
+            "buyerWalletId": buyer_wallet_id,
+            "input": input_data
+        }
+
+        data = await self._request(
+            "POST", f"/api/execute/{service_id}", ExecutionError,
+            "Service execution failed", body=payload
+        )
+        return _parse_execution_result(data)
+
+    async def execute_many(
+        self,
+        execution_requests: List[ExecutionRequest],
+        max_concurrency: int = 8
+    ) -> List[ExecutionResult]:
+        """
+        Execute several services concurrently
+
+        Returns results in the same order as the requests. If any execution
+        fails the rest still run, and BatchExecutionError.results carries
+        the outcome of each request.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(r: ExecutionRequest):
+            async with semaphore:
+                try:
+                    return await self.execute(r.service_id, r.buyer_wallet_id, r.input)
+                except Exception as e:
+                    return e
+
+        return _collect_batch(list(await asyncio.gather(*[run(r) for r in execution_requests])))
+
+    async def get_payment(self, payment_id: str) -> Payment:
+        """Get payment by ID"""
+        data = await self._request(
+            "GET", f"/api/payments/{payment_id}", PaymentError, "Failed to get payment"
+        )
+        payment_data = data.get("payment")
+        if not payment_data:
+            raise PaymentError(f"Payment {payment_id} not found")
+        return _parse_payment(payment_data)
+
+    async def get_receipt(self, receipt_id: str) -> ExecutionReceipt:
+        """Get execution receipt by ID"""
+        data = await self._request(
+            "GET", f"/api/receipts/{receipt_id}", PaymentError, "Failed to get receipt"
+        )
+        receipt_data = data.get("receipt")
+        if not receipt_data:
+            raise PaymentError(f"Receipt {receipt_id} not found")
+        return _parse_receipt(receipt_data)
+
+    def verify_receipt(
+        self,
+        receipt: ExecutionReceipt,
+        input_data: Optional[Dict[str, Any]] = None,
+        output_data: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """Verify a receipt locally (pure hashing, so not a coroutine)"""
+        return verify_receipt(
+            receipt,
+            None if input_data is None else canonical_json(input_data),
+            None if output_data is None else canonical_json(output_data)
+        )
+
+    # Dispute Operations
+
+    async def open_dispute(
+        self,
+        payment_id: str,
+        reason: str,
+        evidence: Optional[str] = None
+    ) -> Dispute:
+        """Open a dispute for a payment"""
+        payload = {
+            "paymentId": payment_id,
+            "reason": reason
+        }
+
+        if evidence:
+            payload["evidence"] = evidence
+
+        data = await self._request(
+            "POST", "/api/disputes", DisputeError, "Failed to open dispute",
+            body=payload
+        )
+        dispute_data = data.get("dispute")
+        if not dispute_data:
+            raise DisputeError("Invalid response: missing dispute data")
+        return _parse_dispute(dispute_data)
+
+    async def get_dispute(self, dispute_id: str) -> Dispute:
+        """Get dispute by ID"""
+        data = await self._request(
+            "GET", f"/api/disputes/{dispute_id}", DisputeError, "Failed to get dispute"
+        )
+        dispute_data = data.get("dispute")
+        if not dispute_data:
+            raise DisputeError(f"Dispute {dispute_id} not found")
+        return _parse_dispute(dispute_data)
+
+    async def get_payment_disputes(self, payment_id: str) -> List[Dispute]:
+        """Get all disputes for a payment"""
+        data = await self._request(
+            "GET", "/api/disputes", DisputeError, "Failed to get payment disputes",
+            params={"paymentId": payment_id}
+        )
+        # Older APIs ignore ?paymentId= and return every dispute of the wallet
+        return [
+            _parse_dispute(d) for d in data.get("disputes", [])
+            if d.get("paymentId") == payment_id
+        ]
+
+    async def add_dispute_evidence(self, dispute_id: str, evidence: str) -> Dispute:
+        """Add evidence to a dispute"""
+        data = await self._request(
+            "POST", f"/api/disputes/{dispute_id}/evidence", DisputeError,
+            "Failed to add evidence", body={"evidence": evidence}
+        )
+        dispute_data = data.get("dispute")
+        if not dispute_data:
+            raise DisputeError("Invalid response: missing dispute data")
+        return _parse_dispute(dispute_data)
+
+    # Webhook Operations
+
+    async def register_webhook(self, url: str, events: List[str]) -> Webhook:
+        """Register a webhook"""
+        data = await self._request(
+            "POST", "/api/webhooks", WebhookError, "Failed to register webhook",
+            body={"url": url, "events": events}
+        )
+        webhook_data = data.get("webhook")
+        if not webhook_data:
+            raise WebhookError("Invalid response: missing webhook data")
+        return _parse_webhook(webhook_data)
+
+    async def get_webhook(self, webhook_id: str) -> Webhook:
+        """Get webhook by ID (looked up in list_webhooks() on APIs without that route)"""
+        if self._webhook_direct_get is not False:
+            try:
+                response = await self._client.get(f"/api/webhooks/{webhook_id}")
+            except httpx.HTTPError as e:
+                raise WebhookError(f"Failed to get webhook: {str(e)}") from e
+
+            if not _is_missing_route(response):
+                self._webhook_direct_get = True
+                if response.status_code == 404:
+                    raise WebhookError(f"Webhook {webhook_id} not found")
+                try:
+                    response.raise_for_status()
+                    data = json_loads(response.content)
+                except (httpx.HTTPError, ValueError) as e:
+                    raise WebhookError(f"Failed to get webhook: {str(e)}") from e
+
+                webhook_data = data.get("webhook")
+                if not webhook_data:
+                    raise WebhookError(f"Webhook {webhook_id} not found")
+                return _parse_webhook(webhook_data)
+
+            # Older API without the route: stop probing for this client
+            self._webhook_direct_get = False
+
+        for webhook in await self.list_webhooks():
+            if webhook.id == webhook_id:
+                return webhook
+        raise WebhookError(f"Webhook {webhook_id} not found")
+
+    async def list_webhooks(self) -> List[Webhook]:
+        """List all registered webhooks"""
+        data = await self._request("GET", "/api/webhooks", WebhookError, "Failed to list webhooks")
+        return [_parse_webhook(w) for w in data.get("webhooks", [])]
+
+    async def delete_webhook(self, webhook_id: str) -> bool:
+        """Delete a webhook"""
+        try:
+            response = await self._client.delete(f"/api/webhooks/{webhook_id}")
+            response.raise_for_status()
+            return True
+        except httpx.HTTPError as e:
+            raise WebhookError(f"Failed to delete webhook: {str(e)}") from e
+
+    async def update_webhook(
+        self,
+        webhook_id: str,
+        url: Optional[str] = None,
+        events: Optional[List[str]] = None,
+        active: Optional[bool] = None
+    ) -> Webhook:
+        """Update a webhook"""
+        payload = {}
+        if url is not None:
+            payload["url"] = url
+        if events is not None:
+            payload["events"] = events
+        if active is not None:
+            payload["active"] = active
+
+        data = await self._request(
+            "PATCH", f"/api/webhooks/{webhook_id}", WebhookError,
+            "Failed to update webhook", body=payload
+        )
+        webhook_data = data.get("webhook")
+        if not webhook_data:
+            raise WebhookError("Invalid response: missing webhook data")
+        return _parse_webhook(webhook_data)
+
+    # Reputation Operations
+
+    async def get_reputation(self, agent_id: str) -> ReputationScore:
+        """Get reputation score for an agent"""
+        data = await self._request(
+            "GET", f"/api/agents/{agent_id}/reputation", AgentPayError,
+            "Failed to get reputation"
+        )
+        rep_data = data.get("reputation")
+        if not rep_data:
+            raise AgentPayError(f"Reputation for agent {agent_id} not found")
+        return _parse_reputation(rep_data)
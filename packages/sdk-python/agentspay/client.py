@@ -1,22 +1,46 @@
 """AgentPay SDK Main Client"""
 
-from typing import Optional, List, Dict, Any
-from .wallet import WalletOperations
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import cached_property
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, Iterator, Union
+from .wallet import WalletOperations, _pick_balance, _wallet_balances
 from .services import ServiceOperations
-from .payments import PaymentOperations
-from .disputes import DisputeOperations
-from .webhooks import WebhookOperations
+from .payments import PaymentOperations, _run_batch
 from .types import (
     AgentWallet,
     Service,
+    ExecutionRequest,
     ExecutionResult,
+    ExecutionReceipt,
     Payment,
     Dispute,
     Webhook,
     ReputationScore
 )
 from .exceptions import AgentPayError
-import requests
+from ._http import DEFAULT_POOL_SIZE, create_session, decode_json, set_auth_header
+from ._errors import wrap
+from ._cache import TTLCache, cached
+from ._dns import warm as warm_dns
+from .verify import canonical_json, verify_receipt
+
+if TYPE_CHECKING:
+    from .disputes import DisputeOperations
+    from .webhooks import WebhookOperations
+
+
+def _parse_reputation(data: dict) -> ReputationScore:
+    """Parse reputation data from API response"""
+    return ReputationScore(
+        agent_id=data["agentId"],
+        total_jobs=data["totalJobs"],
+        success_rate=data["successRate"],
+        avg_response_time_ms=data["avgResponseTimeMs"],
+        total_earned=data["totalEarned"],
+        total_spent=data["totalSpent"],
+        rating=data["rating"]
+    )
 
 
 class AgentPayClient:
@@ -42,7 +66,13 @@ class AgentPayClient:
     def __init__(
         self,
         base_url: str = "http://localhost:3100",
-        api_key: Optional[str] = None
+        api_key: Optional[str] = None,
+        cache_ttl: float = 30.0,
+        http2: bool = False,
+        max_pool_size: int = DEFAULT_POOL_SIZE,
+        http_cache: Union[bool, str] = False,
+        cache_dns: bool = False,
+        max_retries: int = 3
     ):
         """
         Initialize AgentPay client
@@ -50,16 +80,126 @@ class AgentPayClient:
         Args:
             base_url: AgentPay API base URL
             api_key: Optional API key for authentication
+            cache_ttl: Seconds to cache wallet, service, reputation and receipt
+                lookups (0 disables caching)
+            http2: Send requests over HTTP/2 via httpx (requires the
+                ``http2`` extra) instead of HTTP/1.1 keep-alive
+            max_pool_size: Keep-alive connections kept open to the API; raise
+                it if more threads than this share the client
+            http_cache: Honour HTTP caching headers on GETs via hishel
+                (requires the ``cache`` extra); True caches in memory, a
+                file path persists the cache in SQLite across runs
+            cache_dns: Resolve the API host once (in the background, right
+                away) and reuse the address for new connections for 5 minutes
+            max_retries: Retries with exponential backoff for connection
+                failures, 429s (honouring Retry-After) and, for idempotent
+                requests, 5xx replies; 0 disables
         """
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key
+        self._u_agent = self.base_url + "/api/agents/"
+        
+        # Short-lived cache for read-mostly GETs, keyed by (kind, id)
+        self._cache = TTLCache(default_ttl=cache_ttl, max_size=512)
+        
+        # One pooled session shared by every operation module (HTTP keep-alive)
+        self._session = create_session(
+            self.api_key,
+            http2=http2,
+            max_pool_size=max_pool_size,
+            http_cache=http_cache,
+            cache_dns=cache_dns,
+            max_retries=max_retries
+        )
+        
+        # Background pool for cache prefetching, created on first use
+        self._executor: Optional[ThreadPoolExecutor] = None
+        
+        if cache_dns:
+            self._submit(warm_dns, self.base_url)
+    
+    # Operation modules, each constructed on first use
+    
+    @cached_property
+    def _wallet(self) -> WalletOperations:
+        return WalletOperations(self.base_url, self.api_key, self._session)
+    
+    @cached_property
+    def _services(self) -> ServiceOperations:
+        return ServiceOperations(self.base_url, self.api_key, self._session)
+    
+    @cached_property
+    def _payments(self) -> PaymentOperations:
+        return PaymentOperations(self.base_url, self.api_key, self._session)
+    
+    @cached_property
+    def _disputes(self) -> "DisputeOperations":
+        from .disputes import DisputeOperations
+        return DisputeOperations(self.base_url, self.api_key, self._session)
+    
+    @cached_property
+    def _webhooks(self) -> "WebhookOperations":
+        from .webhooks import WebhookOperations
+        return WebhookOperations(
+            self.base_url, self.api_key, self._session, cache_ttl=self._cache.default_ttl
+        )
+    
+    def _submit(self, fn, *args) -> Future:
+        """Run ``fn(*args)`` on the background prefetch pool"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=4, thread_name_prefix="agentspay-prefetch"
+            )
+        return self._executor.submit(fn, *args)
+    
+    def invalidate(self, kind: str, resource_id: str) -> None:
+        """
+        Drop a cached lookup so the next call refetches it
+        
+        Args:
+            kind: "wallet", "service", "reputation" or "receipt"
+            resource_id: ID the lookup was made with
+        """
+        self._cache.delete((kind, resource_id))
+    
+    def set_api_key(self, api_key: Optional[str]) -> None:
+        """
+        Switch the API key used for subsequent requests
+        
+        The session's headers are updated in place, so pooled connections
+        are kept. Cached lookups and remembered not-found IDs are dropped
+        since they were made with the previous key.
         
-        # Initialize operation modules
-        self._wallet = WalletOperations(self.base_url, self.api_key)
-        self._services = ServiceOperations(self.base_url, self.api_key)
-        self._payments = PaymentOperations(self.base_url, self.api_key)
-        self._disputes = DisputeOperations(self.base_url, self.api_key)
-        self._webhooks = WebhookOperations(self.base_url, self.api_key)
+        Args:
+            api_key: New API key, or None to send requests unauthenticated
+        """
+        self.api_key = api_key
+        set_auth_header(self._session.headers, api_key)
+        for name in ("_wallet", "_services", "_payments", "_disputes", "_webhooks"):
+            ops = self.__dict__.get(name)
+            if ops is not None:
+                ops.api_key = api_key
+        self._cache.clear()
+        # Misses too: webhooks are owner-scoped, so a miss may not hold for the new key
+        for name in ("_services", "_webhooks"):
+            ops = self.__dict__.get(name)
+            if ops is not None:
+                ops._misses.clear()
+        if "_webhooks" in self.__dict__:
+            self._webhooks._cache.clear()
+    
+    def close(self) -> None:
+        """Close the underlying HTTP session and release pooled connections"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self._session.close()
+    
+    def __enter__(self) -> "AgentPayClient":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
     
     # Wallet Operations
     
@@ -67,13 +207,18 @@ class AgentPayClient:
         """Create a new agent wallet"""
         return self._wallet.create_wallet()
     
+    @cached("wallet")
     def get_wallet(self, wallet_id: str) -> AgentWallet:
         """Get wallet by ID"""
         return self._wallet.get_wallet(wallet_id)
     
     def get_balance(self, wallet_id: str, currency: str = "BSV") -> int:
         """Get wallet balance for a specific currency"""
-        return self._wallet.get_balance(wallet_id, currency)
+        return _pick_balance(self.get_balances(wallet_id), currency)
+    
+    def get_balances(self, wallet_id: str) -> Dict[str, int]:
+        """Get wallet balances for every currency ({"BSV": ..., "MNEE": ...})"""
+        return _wallet_balances(self.get_wallet(wallet_id))
     
     # Service Operations
     
@@ -115,10 +260,17 @@ class AgentPayClient:
         max_price: Optional[int] = None,
         min_rating: Optional[float] = None,
         limit: int = 20,
-        offset: int = 0
+        offset: int = 0,
+        prefetch: bool = False
     ) -> List[Service]:
-        """Search for services"""
-        return self._services.search_services(
+        """
+        Search for services
+        
+        With ``prefetch=True`` the returned services are stored in the lookup
+        cache and their providers' reputations are fetched in the background,
+        so follow-up get_service()/get_reputation() calls are cache hits.
+        """
+        services = self._services.search_services(
             keyword=keyword,
             category=category,
             max_price=max_price,
@@ -126,11 +278,141 @@ class AgentPayClient:
             limit=limit,
             offset=offset
         )
+        
+        if prefetch:
+            # Search results are full service records, so no refetch is needed
+            for service in services:
+                self._cache.set(("service", service.id), service)
+            for agent_id in dict.fromkeys(s.agent_id for s in services):
+                self._submit(self.get_reputation, agent_id)
+        
+        return services
     
+    def iter_search_services(
+        self,
+        keyword: Optional[str] = None,
+        category: Optional[str] = None,
+        max_price: Optional[int] = None,
+        min_rating: Optional[float] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> Iterator[Service]:
+        """
+        Search for services, streaming results as they are parsed
+        
+        Lets callers stop early without decoding the whole response, e.g.
+        ``next(s for s in client.iter_search_services(limit=1000) if s.price < budget)``.
+        """
+        return self._services.iter_search_services(
+            keyword=keyword,
+            category=category,
+            max_price=max_price,
+            min_rating=min_rating,
+            limit=limit,
+            offset=offset
+        )
+    
+    def search_all_services(
+        self,
+        keyword: Optional[str] = None,
+        category: Optional[str] = None,
+        max_price: Optional[int] = None,
+        min_rating: Optional[float] = None,
+        page_size: int = 100,
+        max_pages: int = 50,
+        max_concurrency: int = 8
+    ) -> List[Service]:
+        """
+        Fetch every page of a service search
+        
+        The first page is fetched on its own; if it is full, later pages are
+        requested ``max_concurrency`` at a time in parallel until a short
+        page marks the end of the results.
+        
+        Returns:
+            List[Service]: All matching services, deduplicated by ID
+        """
+        def fetch(page: int) -> List[Service]:
+            return self._services.search_services(
+                keyword=keyword,
+                category=category,
+                max_price=max_price,
+                min_rating=min_rating,
+                limit=page_size,
+                offset=page * page_size
+            )
+        
+        pages = [fetch(0)]
+        if len(pages[0]) == page_size and max_pages > 1:
+            with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+                next_page = 1
+                while next_page < max_pages:
+                    batch = range(next_page, min(next_page + max_concurrency, max_pages))
+                    results = list(executor.map(fetch, batch))
+                    pages.extend(results)
+                    if any(len(r) < page_size for r in results):
+                        break
+                    next_page = batch.stop
+        
+        # Pages can overlap if services are added mid-scan
+        unique: "OrderedDict[str, Service]" = OrderedDict()
+        for page in pages:
+            for service in page:
+                unique.setdefault(service.id, service)
+        return list(unique.values())
+    
+    def iter_all_services(
+        self,
+        keyword: Optional[str] = None,
+        category: Optional[str] = None,
+        max_price: Optional[int] = None,
+        min_rating: Optional[float] = None,
+        page_size: int = 100,
+        max_pages: int = 50
+    ) -> Iterator[Service]:
+        """
+        Iterate over every page of a service search
+        
+        While the caller works through one page, the next is already being
+        fetched in the background, so only about two pages are held at once.
+        
+        Yields:
+            Service: Matching services, deduplicated by ID
+        """
+        def fetch(page: int) -> List[Service]:
+            return self._services.search_services(
+                keyword=keyword,
+                category=category,
+                max_price=max_price,
+                min_rating=min_rating,
+                limit=page_size,
+                offset=page * page_size
+            )
+        
+        seen = set()
+        pending = self._submit(fetch, 0)
+        for page in range(max_pages):
+            services = pending.result()
+            last = len(services) < page_size or page + 1 == max_pages
+            if not last:
+                pending = self._submit(fetch, page + 1)
+            for service in services:
+                if service.id not in seen:
+                    seen.add(service.id)
+                    yield service
+            if last:
+                return
+    
+    @cached("service")
     def get_service(self, service_id: str) -> Service:
         """Get service by ID"""
         return self._services.get_service(service_id)
     
+    def prefetch_services(self, service_ids: List[str]) -> None:
+        """Warm the lookup cache for ``service_ids`` in the background"""
+        for service_id in service_ids:
+            self._submit(self.get_service, service_id)
+    
     # Payment & Execution Operations
     
     def execute(
@@ -144,16 +426,64 @@ class AgentPayClient:
         
         Returns execution result with payment details and cryptographic receipt
         """
-        return self._payments.execute(service_id, buyer_wallet_id, input_data)
+        result = self._payments.execute(service_id, buyer_wallet_id, input_data)
+        
+        # Balances moved, so drop the cached wallets on both sides
+        self.invalidate("wallet", buyer_wallet_id)
+        if result.payment:
+            self.invalidate("wallet", result.payment.seller_wallet_id)
+        return result
+    
+    def execute_many(
+        self,
+        execution_requests: List[ExecutionRequest],
+        max_concurrency: int = 8
+    ) -> List[ExecutionResult]:
+        """
+        Execute several services concurrently
+        
+        Returns results in the same order as the requests. If any execution
+        fails the rest still run, and BatchExecutionError.results carries
+        the outcome of each request.
+        """
+        # execute() drops cached wallets per request, so partial failures stay fresh
+        return _run_batch(self.execute, execution_requests, max_concurrency)
     
     def get_payment(self, payment_id: str) -> Payment:
         """Get payment by ID"""
         return self._payments.get_payment(payment_id)
     
+    @cached("receipt")
     def get_receipt(self, receipt_id: str):
         """Get execution receipt by ID"""
         return self._payments.get_receipt(receipt_id)
     
+    def verify_receipt(
+        self,
+        receipt: ExecutionReceipt,
+        input_data: Optional[Dict[str, Any]] = None,
+        output_data: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        Verify a receipt locally against the data that was exchanged
+        
+        Recomputes the input, output and receipt hashes with SHA-256; no
+        request is sent to the API.
+        
+        Args:
+            receipt: Receipt from execute() or get_receipt()
+            input_data: Input sent to the service (skipped when None)
+            output_data: Output returned by the service (skipped when None)
+            
+        Returns:
+            bool: True if the receipt is intact and matches the data
+        """
+        return verify_receipt(
+            receipt,
+            None if input_data is None else canonical_json(input_data),
+            None if output_data is None else canonical_json(output_data)
+        )
+    
     # Dispute Operations
     
     def open_dispute(
@@ -201,6 +531,10 @@ class AgentPayClient:
         """List all registered webhooks"""
         return self._webhooks.list_webhooks()
     
+    def iter_webhooks(self) -> Iterator[Webhook]:
+        """Iterate over registered webhooks, parsing each as it is consumed"""
+        return self._webhooks.iter_webhooks()
+    
     def delete_webhook(self, webhook_id: str) -> bool:
         """Delete a webhook"""
         return self._webhooks.delete_webhook(webhook_id)
@@ -217,6 +551,8 @@ class AgentPayClient:
     
     # Reputation Operations
     
+    @wrap(AgentPayError, "Failed to get reputation")
+    @cached("reputation")
     def get_reputation(self, agent_id: str) -> ReputationScore:
         """
         Get reputation score for an agent
@@ -227,30 +563,14 @@ class AgentPayClient:
         Returns:
             ReputationScore: Agent's reputation metrics
         """
-        try:
-            headers = {"Content-Type": "application/json"}
-            if self.api_key:
-                headers["Authorization"] = f"Bearer {self.api_key}"
-            
-            response = requests.get(
-                f"{self.base_url}/api/agents/{agent_id}/reputation",
-                headers=headers
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            rep_data = data.get("reputation")
-            if not rep_data:
-                raise AgentPayError(f"Reputation for agent {agent_id} not found")
-            
-            return ReputationScore(
-                agent_id=rep_data["agentId"],
-                total_jobs=rep_data["totalJobs"],
-                success_rate=rep_data["successRate"],
-                avg_response_time_ms=rep_data["avgResponseTimeMs"],
-                total_earned=rep_data["totalEarned"],
-                total_spent=rep_data["totalSpent"],
-                rating=rep_data["rating"]
-            )
-        except requests.RequestException as e:
-            raise AgentPayError(f"Failed to get reputation: {str(e)}") from e
+        response = self._session.get(
+            self._u_agent + agent_id + "/reputation"
+        )
+        response.raise_for_status()
+        data = decode_json(response)
+        
+        rep_data = data.get("reputation")
+        if not rep_data:
+            raise AgentPayError(f"Reputation for agent {agent_id} not found")
+        
+        return _parse_reputation(rep_data)
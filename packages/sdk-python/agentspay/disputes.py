@@ -1,25 +1,51 @@
 """Dispute management for AgentPay SDK"""
 
 from typing import Optional, List
-import requests
+from ._codegen import make_parser
+from ._http import HTTPSession, create_session, decode_json, json_dumps
+from ._errors import wrap
 from .types import Dispute
 from .exceptions import DisputeError
 
 
+_parse_dispute = make_parser(
+    Dispute,
+    {
+        "id": "id",
+        "payment_id": "paymentId",
+        "buyer_wallet_id": "buyerWalletId",
+        "provider_wallet_id": "providerWalletId",
+        "reason": "reason",
+        "status": "status",
+        "created_at": "createdAt",
+        "evidence": "evidence",
+        "resolution": "resolution",
+        "split_percent": "splitPercent",
+        "resolved_at": "resolvedAt"
+    },
+    optional={"evidence", "resolution", "split_percent", "resolved_at"},
+    doc="Parse dispute data from API response"
+)
+
+
 class DisputeOperations:
     """Handles dispute operations"""
     
-    def __init__(self, base_url: str, api_key: Optional[str] = None):
+    _parse_dispute = staticmethod(_parse_dispute)
+    
+    def __init__(
+        self,
+        base_url: str,
+        api_key: Optional[str] = None,
+        session: Optional[HTTPSession] = None
+    ):
         self.base_url = base_url
         self.api_key = api_key
+        self.session = session if session is not None else create_session(api_key)
+        self._u_disputes = base_url + "/api/disputes"
+        self._u_dispute = base_url + "/api/disputes/"
     
-    def _get_headers(self) -> dict:
-        """Get request headers with API key if available"""
-        headers = {"Content-Type": "application/json"}
-        if self.api_key:
-            headers["Authorization"] = f"Bearer {self.api_key}"
-        return headers
-    
+    @wrap(DisputeError, "Failed to open dispute")
     def open_dispute(
         self,
         payment_id: str,
@@ -48,23 +74,20 @@ class DisputeOperations:
         if evidence:
             payload["evidence"] = evidence
         
-        try:
-            response = requests.post(
-                f"{self.base_url}/api/disputes",
-                json=payload,
-                headers=self._get_headers()
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            dispute_data = data.get("dispute")
-            if not dispute_data:
-                raise DisputeError("Invalid response: missing dispute data")
-            
-            return self._parse_dispute(dispute_data)
-        except requests.RequestException as e:
-            raise DisputeError(f"Failed to open dispute: {str(e)}") from e
+        response = self.session.post(
+            self._u_disputes,
+            data=json_dumps(payload)
+        )
+        response.raise_for_status()
+        data = decode_json(response)
+        
+        dispute_data = data.get("dispute")
+        if not dispute_data:
+            raise DisputeError("Invalid response: missing dispute data")
+        
+        return self._parse_dispute(dispute_data)
     
+    @wrap(DisputeError, "Failed to get dispute")
     def get_dispute(self, dispute_id: str) -> Dispute:
         """
         Get dispute by ID
@@ -78,22 +101,19 @@ class DisputeOperations:
         Raises:
             DisputeError: If dispute not found or request fails
         """
-        try:
-            response = requests.get(
-                f"{self.base_url}/api/disputes/{dispute_id}",
-                headers=self._get_headers()
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            dispute_data = data.get("dispute")
-            if not dispute_data:
-                raise DisputeError(f"Dispute {dispute_id} not found")
-            
-            return self._parse_dispute(dispute_data)
-        except requests.RequestException as e:
-            raise DisputeError(f"Failed to get dispute: {str(e)}") from e
+        response = self.session.get(
+            self._u_dispute + dispute_id
+        )
+        response.raise_for_status()
+        data = decode_json(response)
+        
+        dispute_data = data.get("dispute")
+        if not dispute_data:
+            raise DisputeError(f"Dispute {dispute_id} not found")
+        
+        return self._parse_dispute(dispute_data)
     
+    @wrap(DisputeError, "Failed to get payment disputes")
     def get_payment_disputes(self, payment_id: str) -> List[Dispute]:
         """
         Get all disputes for a payment
@@ -107,19 +127,22 @@ class DisputeOperations:
         Raises:
             DisputeError: If request fails
         """
-        try:
-            response = requests.get(
-                f"{self.base_url}/api/payments/{payment_id}/disputes",
-                headers=self._get_headers()
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            disputes_data = data.get("disputes", [])
-            return [self._parse_dispute(d) for d in disputes_data]
-        except requests.RequestException as e:
-            raise DisputeError(f"Failed to get payment disputes: {str(e)}") from e
+        # Current APIs filter server-side; older ones ignore the parameter and
+        # return every dispute of the wallet, hence the client-side check
+        response = self.session.get(
+            self._u_disputes,
+            params={"paymentId": payment_id}
+        )
+        response.raise_for_status()
+        data = decode_json(response)
+        
+        disputes_data = data.get("disputes", [])
+        return [
+            self._parse_dispute(d) for d in disputes_data
+            if d.get("paymentId") == payment_id
+        ]
     
+    @wrap(DisputeError, "Failed to add evidence")
     def add_evidence(
         self,
         dispute_id: str,
@@ -140,35 +163,15 @@ class DisputeOperations:
         """
         payload = {"evidence": evidence}
         
-        try:
-            response = requests.post(
-                f"{self.base_url}/api/disputes/{dispute_id}/evidence",
-                json=payload,
-                headers=self._get_headers()
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            dispute_data = data.get("dispute")
-            if not dispute_data:
-                raise DisputeError("Invalid response: missing dispute data")
-            
-            return self._parse_dispute(dispute_data)
-        except requests.RequestException as e:
-            raise DisputeError(f"Failed to add evidence: {str(e)}") from e
-    
-    def _parse_dispute(self, data: dict) -> Dispute:
-        """Parse dispute data from API response"""
-        return Dispute(
-            id=data["id"],
-            payment_id=data["paymentId"],
-            buyer_wallet_id=data["buyerWalletId"],
-            provider_wallet_id=data["providerWalletId"],
-            reason=data["reason"],
-            status=data["status"],
-            created_at=data["createdAt"],
-            evidence=data.get("evidence"),
-            resolution=data.get("resolution"),
-            split_percent=data.get("splitPercent"),
-            resolved_at=data.get("resolvedAt")
+        response = self.session.post(
+            self._u_dispute + dispute_id + "/evidence",
+            data=json_dumps(payload)
         )
+        response.raise_for_status()
+        data = decode_json(response)
+        
+        dispute_data = data.get("dispute")
+        if not dispute_data:
+            raise DisputeError("Invalid response: missing dispute data")
+        
+        return self._parse_dispute(dispute_data)
@@ -51,3 +51,27 @@ class ExecutionError(AgentPayError):
     def __init__(self, message: str, execution_result: dict = None):
         super().__init__(message)
         self.execution_result = execution_result
+
+
+class BatchExecutionError(ExecutionError):
+    """
+    Raised when some executions in a batch fail
+    
+    The other executions still ran (and were paid for), so ``results``
+    holds one entry per request, in request order: the ExecutionResult
+    for each success or the exception for each failure.
+    """
+    
+    def __init__(self, message: str, results: list):
+        super().__init__(message)
+        self.results = results
+    
+    @property
+    def errors(self) -> list:
+        """Exceptions of the failed executions, in request order"""
+        return [r for r in self.results if isinstance(r, BaseException)]
+    
+    @property
+    def succeeded(self) -> list:
+        """ExecutionResults of the executions that went through, in request order"""
+        return [r for r in self.results if not isinstance(r, BaseException)]
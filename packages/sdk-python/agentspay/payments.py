@@ -1,25 +1,131 @@
 """Payment and execution operations for AgentPay SDK"""
 
-from typing import Optional, Dict, Any
-import requests
-from .types import ExecutionResult, ExecutionReceipt, Payment
-from .exceptions import PaymentError, ExecutionError
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Callable, List, Union
+from ._codegen import make_parser
+from ._http import HTTPSession, create_session, decode_json, json_dumps
+from ._errors import wrap
+from .types import ExecutionRequest, ExecutionResult, ExecutionReceipt, Payment
+from .exceptions import PaymentError, ExecutionError, BatchExecutionError
+
+
+_parse_payment = make_parser(
+    Payment,
+    {
+        "id": "id",
+        "service_id": "serviceId",
+        "buyer_wallet_id": "buyerWalletId",
+        "seller_wallet_id": "sellerWalletId",
+        "amount": "amount",
+        "platform_fee": "platformFee",
+        "currency": "currency",
+        "status": "status",
+        "created_at": "createdAt",
+        "dispute_status": "disputeStatus",
+        "tx_id": "txId",
+        "completed_at": "completedAt"
+    },
+    optional={"dispute_status", "tx_id", "completed_at"},
+    doc="Parse payment data from API response"
+)
+
+
+_parse_receipt = make_parser(
+    ExecutionReceipt,
+    {
+        "id": "id",
+        "payment_id": "paymentId",
+        "service_id": "serviceId",
+        "input_hash": "inputHash",
+        "output_hash": "outputHash",
+        "timestamp": "timestamp",
+        "execution_time_ms": "executionTimeMs",
+        "provider_signature": "providerSignature",
+        "platform_signature": "platformSignature",
+        "receipt_hash": "receiptHash",
+        "blockchain_tx_id": "blockchainTxId",
+        "blockchain_anchored_at": "blockchainAnchoredAt"
+    },
+    optional={"blockchain_tx_id", "blockchain_anchored_at"},
+    doc="Parse receipt data from API response"
+)
+
+
+def _parse_execution_result(data: dict) -> ExecutionResult:
+    """Parse execution result from API response"""
+    # Parse receipt if available
+    receipt = None
+    if "receipt" in data and data["receipt"]:
+        receipt = _parse_receipt(data["receipt"])
+    
+    # Parse payment if available
+    payment = None
+    if "payment" in data and data["payment"]:
+        payment = _parse_payment(data["payment"])
+    
+    return ExecutionResult(
+        payment_id=data["paymentId"],
+        service_id=data["serviceId"],
+        output=data.get("output", {}),
+        execution_time_ms=data.get("executionTimeMs", 0),
+        status=data.get("status", "success"),
+        receipt=receipt,
+        payment=payment
+    )
+
+
+def _collect_batch(outcomes: List[Union[ExecutionResult, Exception]]) -> List[ExecutionResult]:
+    """Return batch results, or raise BatchExecutionError carrying every outcome"""
+    errors = [o for o in outcomes if isinstance(o, Exception)]
+    if errors:
+        raise BatchExecutionError(
+            f"{len(errors)} of {len(outcomes)} executions failed: {errors[0]}", outcomes
+        ) from errors[0]
+    return outcomes
+
+
+def _run_batch(
+    execute: Callable[[str, str, Dict[str, Any]], ExecutionResult],
+    execution_requests: List[ExecutionRequest],
+    max_concurrency: int
+) -> List[ExecutionResult]:
+    """Run ``execute`` for each request on a bounded thread pool"""
+    if not execution_requests:
+        return []
+    
+    def run(r: ExecutionRequest) -> Union[ExecutionResult, Exception]:
+        # Keep going past failures: the other executions are charged either way
+        try:
+            return execute(r.service_id, r.buyer_wallet_id, r.input)
+        except Exception as e:
+            return e
+    
+    workers = min(max_concurrency, len(execution_requests))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return _collect_batch(list(executor.map(run, execution_requests)))
 
 
 class PaymentOperations:
     """Handles payment and service execution"""
     
-    def __init__(self, base_url: str, api_key: Optional[str] = None):
+    _parse_payment = staticmethod(_parse_payment)
+    _parse_receipt = staticmethod(_parse_receipt)
+    _parse_execution_result = staticmethod(_parse_execution_result)
+    
+    def __init__(
+        self,
+        base_url: str,
+        api_key: Optional[str] = None,
+        session: Optional[HTTPSession] = None
+    ):
         self.base_url = base_url
         self.api_key = api_key
+        self.session = session if session is not None else create_session(api_key)
+        self._u_execute = base_url + "/api/execute/"
+        self._u_payment = base_url + "/api/payments/"
+        self._u_receipt = base_url + "/api/receipts/"
     
-    def _get_headers(self) -> dict:
-        """Get request headers with API key if available"""
-        headers = {"Content-Type": "application/json"}
-        if self.api_key:
-            headers["Authorization"] = f"Bearer {self.api_key}"
-        return headers
-    
+    @wrap(ExecutionError, "Service execution failed")
     def execute(
         self,
         service_id: str,
@@ -45,37 +151,42 @@ class PaymentOperations:
             "input": input_data
         }
         
-        try:
-            response = requests.post(
-                f"{self.base_url}/api/execute/{service_id}",
-                json=payload,
-                headers=self._get_headers()
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            # Parse receipt if available
-            receipt = None
-            if "receipt" in data and data["receipt"]:
-                receipt = self._parse_receipt(data["receipt"])
+        # Serialized up front (orjson when available); Content-Type is on the session
+        response = self.session.post(
+            self._u_execute + service_id,
+            data=json_dumps(payload)
+        )
+        response.raise_for_status()
+        data = decode_json(response)
+        
+        return self._parse_execution_result(data)
+    
+    def execute_many(
+        self,
+        execution_requests: List[ExecutionRequest],
+        max_concurrency: int = 8
+    ) -> List[ExecutionResult]:
+        """
+        Execute several services concurrently
+        
+        Requests are dispatched over a bounded thread pool sharing this
+        module's session, so total time is roughly one round-trip per
+        ``max_concurrency`` executions instead of one per execution.
+        
+        Args:
+            execution_requests: Executions to run
+            max_concurrency: Maximum number of executions in flight
             
-            # Parse payment if available
-            payment = None
-            if "payment" in data and data["payment"]:
-                payment = self._parse_payment(data["payment"])
+        Returns:
+            List[ExecutionResult]: Results, in the same order as the requests
             
-            return ExecutionResult(
-                payment_id=data["paymentId"],
-                service_id=data["serviceId"],
-                output=data.get("output", {}),
-                execution_time_ms=data.get("executionTimeMs", 0),
-                status=data.get("status", "success"),
-                receipt=receipt,
-                payment=payment
-            )
-        except requests.RequestException as e:
-            raise ExecutionError(f"Service execution failed: {str(e)}") from e
+        Raises:
+            BatchExecutionError: If any execution fails; every request
+                still runs, and ``results`` holds each one's outcome
+        """
+        return _run_batch(self.execute, execution_requests, max_concurrency)
     
+    @wrap(PaymentError, "Failed to get payment")
     def get_payment(self, payment_id: str) -> Payment:
         """
         Get payment by ID
@@ -89,22 +200,19 @@ class PaymentOperations:
         Raises:
             PaymentError: If payment not found or request fails
         """
-        try:
-            response = requests.get(
-                f"{self.base_url}/api/payments/{payment_id}",
-                headers=self._get_headers()
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            payment_data = data.get("payment")
-            if not payment_data:
-                raise PaymentError(f"Payment {payment_id} not found")
-            
-            return self._parse_payment(payment_data)
-        except requests.RequestException as e:
-            raise PaymentError(f"Failed to get payment: {str(e)}") from e
+        response = self.session.get(
+            self._u_payment + payment_id
+        )
+        response.raise_for_status()
+        data = decode_json(response)
+        
+        payment_data = data.get("payment")
+        if not payment_data:
+            raise PaymentError(f"Payment {payment_id} not found")
+        
+        return self._parse_payment(payment_data)
     
+    @wrap(PaymentError, "Failed to get receipt")
     def get_receipt(self, receipt_id: str) -> ExecutionReceipt:
         """
         Get execution receipt by ID
@@ -118,52 +226,14 @@ class PaymentOperations:
         Raises:
             PaymentError: If receipt not found or request fails
         """
-        try:
-            response = requests.get(
-                f"{self.base_url}/api/receipts/{receipt_id}",
-                headers=self._get_headers()
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            receipt_data = data.get("receipt")
-            if not receipt_data:
-                raise PaymentError(f"Receipt {receipt_id} not found")
-            
-            return self._parse_receipt(receipt_data)
-        except requests.RequestException as e:
-            raise PaymentError(f"Failed to get receipt: {str(e)}") from e
-    
-    def _parse_payment(self, data: dict) -> Payment:
-        """Parse payment data from API response"""
-        return Payment(
-            id=data["id"],
-            service_id=data["serviceId"],
-            buyer_wallet_id=data["buyerWalletId"],
-            seller_wallet_id=data["sellerWalletId"],
-            amount=data["amount"],
-            platform_fee=data["platformFee"],
-            currency=data["currency"],
-            status=data["status"],
-            created_at=data["createdAt"],
-            dispute_status=data.get("disputeStatus"),
-            tx_id=data.get("txId"),
-            completed_at=data.get("completedAt")
-        )
-    
-    def _parse_receipt(self, data: dict) -> ExecutionReceipt:
-        """Parse receipt data from API response"""
-        return ExecutionReceipt(
-            id=data["id"],
-            payment_id=data["paymentId"],
-            service_id=data["serviceId"],
-            input_hash=data["inputHash"],
-            output_hash=data["outputHash"],
-            timestamp=data["timestamp"],
-            execution_time_ms=data["executionTimeMs"],
-            provider_signature=data["providerSignature"],
-            platform_signature=data["platformSignature"],
-            receipt_hash=data["receiptHash"],
-            blockchain_tx_id=data.get("blockchainTxId"),
-            blockchain_anchored_at=data.get("blockchainAnchoredAt")
+        response = self.session.get(
+            self._u_receipt + receipt_id
         )
+        response.raise_for_status()
+        data = decode_json(response)
+        
+        receipt_data = data.get("receipt")
+        if not receipt_data:
+            raise PaymentError(f"Receipt {receipt_id} not found")
+        
+        return self._parse_receipt(receipt_data)
@@ -1,25 +1,95 @@
 """Service operations for AgentPay SDK"""
 
-from typing import Optional, List
+from typing import Optional, List, Dict, Iterator
 import requests
+from urllib3.exceptions import HTTPError as _Urllib3Error
+from ._codegen import make_parser
+from ._http import HTTPSession, create_session, decode_json, json_dumps
+from ._errors import wrap
+from ._cache import TTLCache
 from .types import Service, ServiceQuery
 from .exceptions import ServiceError
 
+try:  # optional incremental JSON parser ("stream" extra)
+    import ijson
+    _STREAM_ERRORS = (ijson.JSONError, _Urllib3Error)
+except ImportError:
+    ijson = None
+    _STREAM_ERRORS = (_Urllib3Error,)
+
+
+_parse_service = make_parser(
+    Service,
+    {
+        "id": "id",
+        "agent_id": "agentId",
+        "name": "name",
+        "description": "description",
+        "category": "category",
+        "price": "price",
+        "currency": "currency",
+        "endpoint": "endpoint",
+        "method": "method",
+        "active": "active",
+        "timeout": "timeout",
+        "dispute_window": "disputeWindow",
+        "created_at": "createdAt",
+        "updated_at": "updatedAt",
+        "input_schema": "inputSchema",
+        "output_schema": "outputSchema"
+    },
+    optional={"input_schema", "output_schema"},
+    defaults={"timeout": 30, "dispute_window": 30},
+    doc="Parse service data from API response"
+)
+
+
+def _search_params(
+    keyword: Optional[str],
+    category: Optional[str],
+    max_price: Optional[int],
+    min_rating: Optional[float],
+    limit: int,
+    offset: int
+) -> Dict[str, str]:
+    """Build GET /api/services query parameters"""
+    params = {}
+    if keyword:
+        params["q"] = keyword
+    if category:
+        params["category"] = category
+    if max_price is not None:
+        params["maxPrice"] = str(max_price)
+    if min_rating is not None:
+        params["minRating"] = str(min_rating)
+    if limit:
+        params["limit"] = str(limit)
+    if offset:
+        params["offset"] = str(offset)
+    return params
+
 
 class ServiceOperations:
     """Handles service registration and discovery"""
     
-    def __init__(self, base_url: str, api_key: Optional[str] = None):
+    _parse_service = staticmethod(_parse_service)
+    
+    def __init__(
+        self,
+        base_url: str,
+        api_key: Optional[str] = None,
+        session: Optional[HTTPSession] = None,
+        miss_ttl: float = 60.0
+    ):
         self.base_url = base_url
         self.api_key = api_key
+        self.session = session if session is not None else create_session(api_key)
+        # IDs the API recently reported as missing, so repeat lookups fail fast
+        self._misses = TTLCache(default_ttl=miss_ttl)
+        self._u_services = base_url + "/api/services"
+        self._u_service = base_url + "/api/services/"
     
-    def _get_headers(self) -> dict:
-        """Get request headers with API key if available"""
-        headers = {"Content-Type": "application/json"}
-        if self.api_key:
-            headers["Authorization"] = f"Bearer {self.api_key}"
-        return headers
-    
+    @wrap(ServiceError, "Failed to register service")
     def register_service(
         self,
         agent_id: str,
@@ -76,23 +146,20 @@ class ServiceOperations:
         if output_schema:
             payload["outputSchema"] = output_schema
         
-        try:
-            response = requests.post(
-                f"{self.base_url}/api/services",
-                json=payload,
-                headers=self._get_headers()
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            service_data = data.get("service")
-            if not service_data:
-                raise ServiceError("Invalid response: missing service data")
-            
-            return self._parse_service(service_data)
-        except requests.RequestException as e:
-            raise ServiceError(f"Failed to register service: {str(e)}") from e
+        response = self.session.post(
+            self._u_services,
+            data=json_dumps(payload)
+        )
+        response.raise_for_status()
+        data = decode_json(response)
+        
+        service_data = data.get("service")
+        if not service_data:
+            raise ServiceError("Invalid response: missing service data")
+        
+        return self._parse_service(service_data)
     
+    @wrap(ServiceError, "Failed to search services")
     def search_services(
         self,
         keyword: Optional[str] = None,
@@ -119,34 +186,71 @@ class ServiceOperations:
         Raises:
             ServiceError: If search fails
         """
-        params = {}
-        if keyword:
-            params["q"] = keyword
-        if category:
-            params["category"] = category
-        if max_price is not None:
-            params["maxPrice"] = str(max_price)
-        if min_rating is not None:
-            params["minRating"] = str(min_rating)
-        if limit:
-            params["limit"] = str(limit)
-        if offset:
-            params["offset"] = str(offset)
+        params = _search_params(keyword, category, max_price, min_rating, limit, offset)
+        
+        response = self.session.get(
+            self._u_services,
+            params=params
+        )
+        response.raise_for_status()
+        data = decode_json(response)
+        
+        services_data = data.get("services", [])
+        return [self._parse_service(s) for s in services_data]
+    
+    def iter_search_services(
+        self,
+        keyword: Optional[str] = None,
+        category: Optional[str] = None,
+        max_price: Optional[int] = None,
+        min_rating: Optional[float] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> Iterator[Service]:
+        """
+        Search for services, yielding each one as it is parsed
+        
+        With ijson installed (the ``stream`` extra) the response body is
+        parsed incrementally, so memory stays flat for large ``limit`` values
+        and breaking out of the loop early skips decoding the rest. Without
+        it, or on an HTTP/2 session, this falls back to search_services().
+        
+        Args:
+            Same as search_services()
+            
+        Yields:
+            Service: Matching services in API order
+            
+        Raises:
+            ServiceError: If search fails
+        """
+        params = _search_params(keyword, category, max_price, min_rating, limit, offset)
         
         try:
-            response = requests.get(
-                f"{self.base_url}/api/services",
-                params=params,
-                headers=self._get_headers()
-            )
+            response = self.session.get(self._u_services, params=params, stream=True)
+        except requests.RequestException as e:
+            raise ServiceError(f"Failed to search services: {str(e)}") from e
+        
+        raw = getattr(response, "raw", None)
+        try:
             response.raise_for_status()
-            data = response.json()
+            if ijson is None or raw is None:
+                data = decode_json(response)
+                for s in data.get("services", []):
+                    yield self._parse_service(s)
+                return
             
-            services_data = data.get("services", [])
-            return [self._parse_service(s) for s in services_data]
+            raw.decode_content = True  # let urllib3 undo gzip/deflate
+            for s in ijson.items(raw, "services.item", use_float=True):
+                yield self._parse_service(s)
         except requests.RequestException as e:
             raise ServiceError(f"Failed to search services: {str(e)}") from e
+        except _STREAM_ERRORS as e:
+            raise ServiceError(f"Failed to search services: {str(e)}") from e
+        finally:
+            response.close()
     
+    @wrap(ServiceError, "Failed to get service")
     def get_service(self, service_id: str) -> Service:
         """
         Get service by ID
@@ -160,39 +264,20 @@ class ServiceOperations:
         Raises:
             ServiceError: If service not found or request fails
         """
-        try:
-            response = requests.get(
-                f"{self.base_url}/api/services/{service_id}",
-                headers=self._get_headers()
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            service_data = data.get("service")
-            if not service_data:
-                raise ServiceError(f"Service {service_id} not found")
-            
-            return self._parse_service(service_data)
-        except requests.RequestException as e:
-            raise ServiceError(f"Failed to get service: {str(e)}") from e
-    
-    def _parse_service(self, data: dict) -> Service:
-        """Parse service data from API response"""
-        return Service(
-            id=data["id"],
-            agent_id=data["agentId"],
-            name=data["name"],
-            description=data["description"],
-            category=data["category"],
-            price=data["price"],
-            currency=data["currency"],
-            endpoint=data["endpoint"],
-            method=data["method"],
-            active=data["active"],
-            timeout=data.get("timeout", 30),
-            dispute_window=data.get("disputeWindow", 30),
-            created_at=data["createdAt"],
-            updated_at=data["updatedAt"],
-            input_schema=data.get("inputSchema"),
-            output_schema=data.get("outputSchema")
+        if self._misses.get(service_id, False):
+            raise ServiceError(f"Service {service_id} not found")
+        
+        response = self.session.get(
+            self._u_service + service_id
         )
+        if response.status_code != 404:
+            response.raise_for_status()
+            service_data = decode_json(response).get("service")
+        else:
+            service_data = None
+        
+        if not service_data:
+            self._misses.set(service_id, True)
+            raise ServiceError(f"Service {service_id} not found")
+        
+        return self._parse_service(service_data)
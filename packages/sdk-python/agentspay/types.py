@@ -1,10 +1,17 @@
 """AgentPay SDK Type Definitions"""
 
+from __future__ import annotations
+
+import sys
 from dataclasses import dataclass, field
 from typing import Optional, Literal, Dict, Any
 from datetime import datetime
 
 
+# Slotted dataclasses (Python 3.10+) drop the per-instance __dict__
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
 Currency = Literal["BSV", "MNEE"]
 PaymentStatus = Literal["pending", "escrowed", "released", "disputed", "refunded"]
 DisputeStatus = Literal["open", "under_review", "resolved_refund", "resolved_release", "resolved_split", "expired"]
@@ -13,7 +20,7 @@ ExecutionStatus = Literal["success", "error"]
 HttpMethod = Literal["POST", "GET"]
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class AgentWallet:
     """Agent wallet representation"""
     id: str
@@ -24,7 +31,7 @@ class AgentWallet:
     balance_mnee: Optional[int] = None  # cents (MNEE)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Service:
     """Service registration"""
     id: str
@@ -45,7 +52,7 @@ class Service:
     output_schema: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Payment:
     """Payment record"""
     id: str
@@ -62,7 +69,7 @@ class Payment:
     completed_at: Optional[str] = None
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ExecutionRequest:
     """Service execution request"""
     service_id: str
@@ -70,7 +77,7 @@ class ExecutionRequest:
     input: Dict[str, Any]
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ExecutionResult:
     """Service execution result"""
     payment_id: str
@@ -82,7 +89,7 @@ class ExecutionResult:
     payment: Optional[Payment] = None
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ExecutionReceipt:
     """Cryptographic execution receipt"""
     id: str
@@ -99,7 +106,7 @@ class ExecutionReceipt:
     blockchain_anchored_at: Optional[str] = None
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ReputationScore:
     """Agent reputation metrics"""
     agent_id: str
@@ -111,7 +118,7 @@ class ReputationScore:
     rating: float  # 1-5
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Dispute:
     """Dispute record"""
     id: str
@@ -127,7 +134,7 @@ class Dispute:
     resolved_at: Optional[str] = None
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Webhook:
     """Webhook registration"""
     id: str
@@ -138,7 +145,7 @@ class Webhook:
     secret: Optional[str] = None
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ServiceQuery:
     """Service search query"""
     category: Optional[str] = None
@@ -0,0 +1,140 @@
+"""Local verification of AgentPay execution receipts"""
+
+import hashlib
+import hmac
+import json
+from decimal import Decimal
+from typing import Any, Iterable, Optional, Union
+
+from .types import ExecutionReceipt
+
+
+def _filter_keys(value: Any, keys: Iterable[str]) -> Any:
+    """Apply JSON.stringify's property-list replacer to nested values"""
+    if isinstance(value, dict):
+        return {k: _filter_keys(value[k], keys) for k in keys if k in value}
+    if isinstance(value, (list, tuple)):
+        return [_filter_keys(item, keys) for item in value]
+    return value
+
+
+def _js_number(x: float) -> str:
+    """Format a float the way ECMAScript's Number::toString does"""
+    if x != x or x in (float("inf"), float("-inf")):
+        return "null"  # JSON.stringify writes non-finite numbers as null
+    if x == 0:
+        return "0"
+    # repr() yields the shortest round-tripping digits, the same ones JS picks;
+    # only the layout differs (JS writes 3.2e-05 as 0.000032, 2.0 as 2, ...)
+    _, digit_tuple, exp = Decimal(repr(abs(x))).as_tuple()
+    digits = "".join(map(str, digit_tuple))
+    stripped = digits.rstrip("0")
+    exp += len(digits) - len(stripped)
+    digits = stripped
+    k = len(digits)
+    n = exp + k  # value is 0.<digits> * 10**n
+    if k <= n <= 21:
+        text = digits + "0" * (n - k)
+    elif 0 < n <= 21:
+        text = digits[:n] + "." + digits[n:]
+    elif -6 < n <= 0:
+        text = "0." + "0" * -n + digits
+    else:
+        e = n - 1
+        mantissa = digits[0] + ("." + digits[1:] if k > 1 else "")
+        text = f"{mantissa}e{'+' if e >= 0 else '-'}{abs(e)}"
+    return "-" + text if x < 0 else text
+
+
+def _encode(obj: Any) -> str:
+    if isinstance(obj, float):
+        return _js_number(obj)
+    if isinstance(obj, dict):
+        return "{" + ",".join(
+            f"{json.dumps(str(k), ensure_ascii=False)}:{_encode(v)}" for k, v in obj.items()
+        ) + "}"
+    if isinstance(obj, (list, tuple)):
+        return "[" + ",".join(_encode(item) for item in obj) + "]"
+    return json.dumps(obj, ensure_ascii=False)
+
+
+def _stringify(obj: Any) -> bytes:
+    """Serialize like JavaScript's JSON.stringify (compact, UTF-8, JS number format)"""
+    return _encode(obj).encode("utf-8")
+
+
+def canonical_json(data: dict) -> bytes:
+    """
+    Canonicalize input/output data the way the API does before hashing
+
+    Mirrors ``JSON.stringify(data, Object.keys(data).sort())`` on the
+    server: top-level keys are sorted, and nested objects keep only keys
+    that also appear at the top level.
+
+    Args:
+        data: Service input or output data
+
+    Returns:
+        bytes: Canonical JSON encoding of ``data``
+    """
+    keys = sorted(data)
+    return _stringify(_filter_keys(data, keys))
+
+
+def hash_data(data: Union[dict, bytes]) -> str:
+    """SHA-256 hex digest of ``data`` (canonicalized first if it is a dict)"""
+    if isinstance(data, dict):
+        data = canonical_json(data)
+    return hashlib.sha256(data).hexdigest()
+
+
+def compute_receipt_hash(receipt: ExecutionReceipt) -> str:
+    """Recompute the integrity hash the API stores as ``receipt_hash``"""
+    return hash_data(_stringify({
+        "id": receipt.id,
+        "paymentId": receipt.payment_id,
+        "serviceId": receipt.service_id,
+        "inputHash": receipt.input_hash,
+        "outputHash": receipt.output_hash,
+        "timestamp": receipt.timestamp,
+        "executionTimeMs": receipt.execution_time_ms,
+        "providerSignature": receipt.provider_signature,
+        "platformSignature": receipt.platform_signature,
+    }))
+
+
+def verify_receipt(
+    receipt: ExecutionReceipt,
+    canonical_input: Optional[bytes] = None,
+    canonical_output: Optional[bytes] = None
+) -> bool:
+    """
+    Verify a receipt locally, without a network round trip
+
+    Checks that ``receipt_hash`` matches the other receipt fields and, when
+    given, that the canonical input/output bytes hash to ``input_hash`` and
+    ``output_hash``. ``hashlib`` uses OpenSSL's SHA-256, which picks up the
+    CPU's SHA extensions (Intel Goldmont+, AMD Zen+, Apple Silicon)
+    automatically.
+
+    The provider and platform signatures are HMACs keyed with server-side
+    secrets, so they cannot be checked here; they are covered by
+    ``receipt_hash`` only.
+
+    Args:
+        receipt: Receipt returned by execute() or get_receipt()
+        canonical_input: Input data encoded with canonical_json()
+        canonical_output: Output data encoded with canonical_json()
+
+    Returns:
+        bool: True if every check passes
+    """
+    if canonical_input is not None and not hmac.compare_digest(
+        hash_data(canonical_input), receipt.input_hash
+    ):
+        return False
+    if canonical_output is not None and not hmac.compare_digest(
+        hash_data(canonical_output), receipt.output_hash
+    ):
+        return False
+    return hmac.compare_digest(compute_receipt_hash(receipt), receipt.receipt_hash)
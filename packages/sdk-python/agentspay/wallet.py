@@ -1,25 +1,60 @@
 """Wallet operations for AgentPay SDK"""
 
-from typing import Optional
-import requests
+from typing import Optional, Dict
+from ._codegen import make_parser
+from ._http import HTTPSession, create_session, decode_json
+from ._errors import wrap
 from .types import AgentWallet
 from .exceptions import WalletError, APIError
 
 
+_parse_wallet = make_parser(
+    AgentWallet,
+    {
+        "id": "id",
+        "public_key": "publicKey",
+        "address": "address",
+        "created_at": "createdAt",
+        "balance": "balance",
+        "balance_mnee": "balanceMnee"
+    },
+    optional={"balance", "balance_mnee"},
+    doc="Parse wallet data from API response"
+)
+
+
+def _wallet_balances(wallet: AgentWallet) -> Dict[str, int]:
+    """Collect every currency balance of a wallet"""
+    return {"BSV": wallet.balance or 0, "MNEE": wallet.balance_mnee or 0}
+
+
+def _pick_balance(balances: Dict[str, int], currency: str) -> int:
+    """Pick the balance for ``currency`` out of a balances dict"""
+    try:
+        return balances[currency.upper()]
+    except KeyError:
+        raise WalletError(f"Invalid currency: {currency}") from None
+
+
 class WalletOperations:
     """Handles wallet-related operations"""
     
-    def __init__(self, base_url: str, api_key: Optional[str] = None):
+    _parse_wallet = staticmethod(_parse_wallet)
+    
+    def __init__(
+        self,
+        base_url: str,
+        api_key: Optional[str] = None,
+        session: Optional[HTTPSession] = None
+    ):
         self.base_url = base_url
         self.api_key = api_key
+        self.session = session if session is not None else create_session(api_key)
+        # URL prefixes built once; per-call URLs are a single concatenation
+        self._u_wallets = base_url + "/api/wallets"
+        self._u_wallet = base_url + "/api/wallets/"
     
-    def _get_headers(self) -> dict:
-        """Get request headers with API key if available"""
-        headers = {"Content-Type": "application/json"}
-        if self.api_key:
-            headers["Authorization"] = f"Bearer {self.api_key}"
-        return headers
-    
+    @wrap(WalletError, "Failed to create wallet")
     def create_wallet(self) -> AgentWallet:
         """
         Create a new agent wallet
@@ -30,29 +65,19 @@ class WalletOperations:
         Raises:
             WalletError: If wallet creation fails
         """
-        try:
-            response = requests.post(
-                f"{self.base_url}/api/wallets",
-                headers=self._get_headers()
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            wallet_data = data.get("wallet")
-            if not wallet_data:
-                raise WalletError("Invalid response: missing wallet data")
-            
-            return AgentWallet(
-                id=wallet_data["id"],
-                public_key=wallet_data["publicKey"],
-                address=wallet_data["address"],
-                created_at=wallet_data["createdAt"],
-                balance=wallet_data.get("balance"),
-                balance_mnee=wallet_data.get("balanceMnee")
-            )
-        except requests.RequestException as e:
-            raise WalletError(f"Failed to create wallet: {str(e)}") from e
+        response = self.session.post(
+            self._u_wallets
+        )
+        response.raise_for_status()
+        data = decode_json(response)
+        
+        wallet_data = data.get("wallet")
+        if not wallet_data:
+            raise WalletError("Invalid response: missing wallet data")
+        
+        return self._parse_wallet(wallet_data)
     
+    @wrap(WalletError, "Failed to get wallet")
     def get_wallet(self, wallet_id: str) -> AgentWallet:
         """
         Get wallet by ID
@@ -66,28 +91,17 @@ class WalletOperations:
         Raises:
             WalletError: If wallet not found or request fails
         """
-        try:
-            response = requests.get(
-                f"{self.base_url}/api/wallets/{wallet_id}",
-                headers=self._get_headers()
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            wallet_data = data.get("wallet")
-            if not wallet_data:
-                raise WalletError(f"Wallet {wallet_id} not found")
-            
-            return AgentWallet(
-                id=wallet_data["id"],
-                public_key=wallet_data["publicKey"],
-                address=wallet_data["address"],
-                created_at=wallet_data["createdAt"],
-                balance=wallet_data.get("balance"),
-                balance_mnee=wallet_data.get("balanceMnee")
-            )
-        except requests.RequestException as e:
-            raise WalletError(f"Failed to get wallet: {str(e)}") from e
+        response = self.session.get(
+            self._u_wallet + wallet_id
+        )
+        response.raise_for_status()
+        data = decode_json(response)
+        
+        wallet_data = data.get("wallet")
+        if not wallet_data:
+            raise WalletError(f"Wallet {wallet_id} not found")
+        
+        return self._parse_wallet(wallet_data)
     
     def get_balance(self, wallet_id: str, currency: str = "BSV") -> int:
         """
@@ -103,11 +117,19 @@ class WalletOperations:
         Raises:
             WalletError: If balance cannot be retrieved
         """
-        wallet = self.get_wallet(wallet_id)
+        return _pick_balance(self.get_balances(wallet_id), currency)
+    
+    def get_balances(self, wallet_id: str) -> Dict[str, int]:
+        """
+        Get wallet balances for every currency from a single wallet lookup
         
-        if currency.upper() == "BSV":
-            return wallet.balance or 0
-        elif currency.upper() == "MNEE":
-            return wallet.balance_mnee or 0
-        else:
-            raise WalletError(f"Invalid currency: {currency}")
+        Args:
+            wallet_id: Wallet ID
+            
+        Returns:
+            Dict[str, int]: {"BSV": satoshis, "MNEE": cents}
+            
+        Raises:
+            WalletError: If balances cannot be retrieved
+        """
+        return _wallet_balances(self.get_wallet(wallet_id))
@@ -1,25 +1,73 @@
 """Webhook management for AgentPay SDK"""
 
-from typing import Optional, List
+from typing import TYPE_CHECKING, Optional, List, Iterator, Union
 import requests
+from ._codegen import make_parser
+from ._http import HTTPResponse, HTTPSession, create_session, decode_json, json_dumps
+from ._errors import wrap
+from ._cache import MISSING, TTLCache
 from .types import Webhook
 from .exceptions import WebhookError
 
+if TYPE_CHECKING:
+    import httpx
+
+
+_parse_webhook = make_parser(
+    Webhook,
+    {
+        "id": "id",
+        "url": "url",
+        "events": "events",
+        "active": "active",
+        "created_at": "createdAt",
+        "secret": "secret"
+    },
+    optional={"secret"},
+    doc="Parse webhook data from API response"
+)
+
+
+def _is_missing_route(response: Union[HTTPResponse, "httpx.Response"]) -> bool:
+    """Check whether the API has no GET /api/webhooks/{id} route at all"""
+    if response.status_code == 405:
+        return True
+    if response.status_code != 404:
+        return False
+    # The API answers unknown IDs with a JSON error; unknown routes get the
+    # framework's default (non-JSON) 404 page
+    try:
+        return "error" not in decode_json(response)
+    except (requests.RequestException, AttributeError):
+        return True
+
 
 class WebhookOperations:
     """Handles webhook registration and management"""
     
-    def __init__(self, base_url: str, api_key: Optional[str] = None):
+    _parse_webhook = staticmethod(_parse_webhook)
+    
+    def __init__(
+        self,
+        base_url: str,
+        api_key: Optional[str] = None,
+        session: Optional[HTTPSession] = None,
+        cache_ttl: float = 30.0,
+        miss_ttl: float = 60.0
+    ):
         self.base_url = base_url
         self.api_key = api_key
+        self.session = session if session is not None else create_session(api_key)
+        # Webhooks by ID, filled by every call that returns one (0 disables)
+        self._cache = TTLCache(default_ttl=cache_ttl)
+        # IDs the API recently reported as missing, so repeat lookups fail fast
+        self._misses = TTLCache(default_ttl=miss_ttl)
+        # Whether the API serves GET /api/webhooks/{id} (None = not probed yet)
+        self._direct_get: Optional[bool] = None
+        self._u_webhooks = base_url + "/api/webhooks"
+        self._u_webhook = base_url + "/api/webhooks/"
     
-    def _get_headers(self) -> dict:
-        """Get request headers with API key if available"""
-        headers = {"Content-Type": "application/json"}
-        if self.api_key:
-            headers["Authorization"] = f"Bearer {self.api_key}"
-        return headers
-    
+    @wrap(WebhookError, "Failed to register webhook")
     def register_webhook(
         self,
         url: str,
@@ -44,27 +92,31 @@ class WebhookOperations:
             "events": events
         }
         
-        try:
-            response = requests.post(
-                f"{self.base_url}/api/webhooks",
-                json=payload,
-                headers=self._get_headers()
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            webhook_data = data.get("webhook")
-            if not webhook_data:
-                raise WebhookError("Invalid response: missing webhook data")
-            
-            return self._parse_webhook(webhook_data)
-        except requests.RequestException as e:
-            raise WebhookError(f"Failed to register webhook: {str(e)}") from e
+        response = self.session.post(
+            self._u_webhooks,
+            data=json_dumps(payload)
+        )
+        response.raise_for_status()
+        data = decode_json(response)
+        
+        webhook_data = data.get("webhook")
+        if not webhook_data:
+            raise WebhookError("Invalid response: missing webhook data")
+        
+        webhook = self._parse_webhook(webhook_data)
+        self._cache.set(webhook.id, webhook)
+        return webhook
     
+    @wrap(WebhookError, "Failed to get webhook")
     def get_webhook(self, webhook_id: str) -> Webhook:
         """
         Get webhook by ID
         
+        Served from the cache when the webhook was returned by a recent
+        list_webhooks(), register_webhook() or update_webhook() call.
+        Otherwise fetched directly; against an API without that route the
+        webhook is looked up in list_webhooks() instead.
+        
         Args:
             webhook_id: Webhook ID
             
@@ -74,21 +126,40 @@ class WebhookOperations:
         Raises:
             WebhookError: If webhook not found or request fails
         """
-        try:
-            response = requests.get(
-                f"{self.base_url}/api/webhooks/{webhook_id}",
-                headers=self._get_headers()
+        webhook = self._cache.get(webhook_id)
+        if webhook is not MISSING:
+            return webhook
+        if self._misses.get(webhook_id, False):
+            raise WebhookError(f"Webhook {webhook_id} not found")
+        
+        if self._direct_get is not False:
+            response = self.session.get(
+                self._u_webhook + webhook_id
             )
-            response.raise_for_status()
-            data = response.json()
+            if not _is_missing_route(response):
+                self._direct_get = True
+                if response.status_code != 404:
+                    response.raise_for_status()
+                    webhook_data = decode_json(response).get("webhook")
+                else:
+                    webhook_data = None
+                
+                if not webhook_data:
+                    self._misses.set(webhook_id, True)
+                    raise WebhookError(f"Webhook {webhook_id} not found")
+                
+                webhook = self._parse_webhook(webhook_data)
+                self._cache.set(webhook_id, webhook)
+                return webhook
             
-            webhook_data = data.get("webhook")
-            if not webhook_data:
-                raise WebhookError(f"Webhook {webhook_id} not found")
-            
-            return self._parse_webhook(webhook_data)
-        except requests.RequestException as e:
-            raise WebhookError(f"Failed to get webhook: {str(e)}") from e
+            # Older API without the route: stop probing for this session
+            self._direct_get = False
+        
+        for webhook in self.iter_webhooks():
+            if webhook.id == webhook_id:
+                return webhook
+        self._misses.set(webhook_id, True)
+        raise WebhookError(f"Webhook {webhook_id} not found")
     
     def list_webhooks(self) -> List[Webhook]:
         """
@@ -97,22 +168,37 @@ class WebhookOperations:
         Returns:
             List[Webhook]: List of webhooks
             
+        Raises:
+            WebhookError: If request fails
+        """
+        return list(self.iter_webhooks())
+    
+    def iter_webhooks(self) -> Iterator[Webhook]:
+        """
+        List registered webhooks, parsing each one only as it is consumed
+        
+        Yields:
+            Webhook: Registered webhooks in API order
+            
         Raises:
             WebhookError: If request fails
         """
         try:
-            response = requests.get(
-                f"{self.base_url}/api/webhooks",
-                headers=self._get_headers()
+            response = self.session.get(
+                self._u_webhooks
             )
             response.raise_for_status()
-            data = response.json()
-            
-            webhooks_data = data.get("webhooks", [])
-            return [self._parse_webhook(w) for w in webhooks_data]
+            data = decode_json(response)
         except requests.RequestException as e:
             raise WebhookError(f"Failed to list webhooks: {str(e)}") from e
+        
+        for w in data.get("webhooks", []):
+            webhook = self._parse_webhook(w)
+            self._cache.set(webhook.id, webhook)
+            self._misses.delete(webhook.id)
+            yield webhook
     
+    @wrap(WebhookError, "Failed to delete webhook")
     def delete_webhook(self, webhook_id: str) -> bool:
         """
         Delete a webhook
@@ -126,16 +212,14 @@ class WebhookOperations:
         Raises:
             WebhookError: If deletion fails
         """
-        try:
-            response = requests.delete(
-                f"{self.base_url}/api/webhooks/{webhook_id}",
-                headers=self._get_headers()
-            )
-            response.raise_for_status()
-            return True
-        except requests.RequestException as e:
-            raise WebhookError(f"Failed to delete webhook: {str(e)}") from e
+        self._cache.delete(webhook_id)
+        response = self.session.delete(
+            self._u_webhook + webhook_id
+        )
+        response.raise_for_status()
+        return True
     
+    @wrap(WebhookError, "Failed to update webhook")
     def update_webhook(
         self,
         webhook_id: str,
@@ -166,30 +250,18 @@ class WebhookOperations:
         if active is not None:
             payload["active"] = active
         
-        try:
-            response = requests.patch(
-                f"{self.base_url}/api/webhooks/{webhook_id}",
-                json=payload,
-                headers=self._get_headers()
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            webhook_data = data.get("webhook")
-            if not webhook_data:
-                raise WebhookError("Invalid response: missing webhook data")
-            
-            return self._parse_webhook(webhook_data)
-        except requests.RequestException as e:
-            raise WebhookError(f"Failed to update webhook: {str(e)}") from e
-    
-    def _parse_webhook(self, data: dict) -> Webhook:
-        """Parse webhook data from API response"""
-        return Webhook(
-            id=data["id"],
-            url=data["url"],
-            events=data["events"],
-            active=data["active"],
-            created_at=data["createdAt"],
-            secret=data.get("secret")
+        self._cache.delete(webhook_id)
+        response = self.session.patch(
+            self._u_webhook + webhook_id,
+            data=json_dumps(payload)
         )
+        response.raise_for_status()
+        data = decode_json(response)
+        
+        webhook_data = data.get("webhook")
+        if not webhook_data:
+            raise WebhookError("Invalid response: missing webhook data")
+        
+        webhook = self._parse_webhook(webhook_data)
+        self._cache.set(webhook_id, webhook)
+        return webhook
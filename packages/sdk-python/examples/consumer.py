@@ -9,9 +9,19 @@ This example shows how to:
 4. Handle disputes if needed
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from agentspay import AgentPayClient
 import json
 
+
+def _safe_rep(client, agent_id):
+    """Fetch an agent's reputation, or None if it is unavailable"""
+    try:
+        return client.get_reputation(agent_id)
+    except Exception:
+        return None
+
+
 # Initialize client
 client = AgentPayClient(
     base_url="http://localhost:3100",
@@ -25,9 +35,8 @@ print(f"✓ Wallet created: {wallet.id}")
 print(f"  Address: {wallet.address}")
 
 # Check balance
-balance_bsv = client.get_balance(wallet.id, currency="BSV")
-balance_mnee = client.get_balance(wallet.id, currency="MNEE")
-print(f"  Balance: {balance_bsv} satoshis (BSV), {balance_mnee} cents (MNEE)")
+balances = client.get_balances(wallet.id)
+print(f"  Balance: {balances['BSV']} satoshis (BSV), {balances['MNEE']} cents (MNEE)")
 
 # Step 2: Search for services
 print("\n" + "="*60)
@@ -45,6 +54,12 @@ if not services:
     print("No services found. Make sure there are registered services.")
     exit(1)
 
+# Fetch provider reputations in parallel (one request per distinct provider,
+# all sharing the client's pooled connections)
+agent_ids = list(dict.fromkeys(s.agent_id for s in services))
+with ThreadPoolExecutor(max_workers=min(8, len(agent_ids))) as ex:
+    reputations = dict(zip(agent_ids, ex.map(lambda a: _safe_rep(client, a), agent_ids)))
+
 print(f"\nFound {len(services)} services:\n")
 for i, service in enumerate(services, 1):
     print(f"{i}. {service.name}")
@@ -53,12 +68,12 @@ for i, service in enumerate(services, 1):
     print(f"   Category: {service.category}")
     print(f"   Provider: {service.agent_id}")
     
-    # Check provider reputation
-    try:
-        reputation = client.get_reputation(service.agent_id)
+    # Provider reputation (prefetched above)
+    reputation = reputations[service.agent_id]
+    if reputation:
         print(f"   Rating: {reputation.rating}/5 ({reputation.total_jobs} jobs, "
               f"{reputation.success_rate * 100:.1f}% success)")
-    except:
+    else:
         print(f"   Rating: No reputation data")
     print()
 
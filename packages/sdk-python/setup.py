@@ -39,11 +39,32 @@ setup(
     python_requires=">=3.8",
     install_requires=[
         "requests>=2.28.0",
+        "urllib3>=1.26",
+        "typing_extensions>=4.0.0; python_version<'3.10'",
     ],
     extras_require={
+        "async": [
+            "httpx[http2]>=0.24.0",
+        ],
+        "http2": [
+            "httpx[http2]>=0.24.0",
+        ],
+        "fast": [
+            "orjson>=3.6.0",
+            "brotli>=1.0.9",
+        ],
+        "stream": [
+            "ijson>=3.1.0",
+        ],
+        "cache": [
+            "hishel>=1.4.0",
+        ],
         "dev": [
             "pytest>=7.0.0",
             "pytest-cov>=4.0.0",
+            "pytest-xdist>=3.0.0",
+            "pytest-timeout>=2.1.0",
+            "pytest-benchmark>=4.0.0",
             "black>=23.0.0",
             "mypy>=1.0.0",
             "ruff>=0.0.260",
@@ -0,0 +1,198 @@
+"""Shared fixtures for AgentPay SDK tests"""
+
+import json
+import os
+from functools import cached_property
+import pytest
+import requests
+from unittest.mock import Mock
+
+from agentspay import AgentPayClient
+
+
+# Node IDs of tests that exceeded their timeout; skipped on later runs
+SKIPFILE = os.path.join(os.path.dirname(__file__), "skipfile.txt")
+_SKIPFILE_ENTRIES = pytest.StashKey[set]()
+
+
+def _read_skipfile():
+    try:
+        with open(SKIPFILE) as f:
+            return {line.strip() for line in f if line.strip()}
+    except FileNotFoundError:
+        return set()
+
+
+def pytest_configure(config):
+    config.stash[_SKIPFILE_ENTRIES] = _read_skipfile()
+
+
+def pytest_collection_modifyitems(config, items):
+    # Benchmarks only measure anything when asked for (and never under xdist)
+    if not config.getoption("benchmark_only", default=False):
+        bench = pytest.mark.skip(reason="benchmark; run with --benchmark-only")
+        for item in items:
+            if "benchmark" in getattr(item, "fixturenames", ()):
+                item.add_marker(bench)
+
+    slow = config.stash[_SKIPFILE_ENTRIES]
+    if not slow:
+        return
+    marker = pytest.mark.skip(reason=f"timed out on an earlier run (listed in {SKIPFILE})")
+    for item in items:
+        if item.nodeid in slow:
+            item.add_marker(marker)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    if (
+        report.failed
+        and call.excinfo is not None
+        and call.excinfo.errisinstance(pytest.fail.Exception)
+        and str(call.excinfo.value).startswith("Timeout")
+    ):
+        with open(SKIPFILE, "a") as f:
+            f.write(item.nodeid + "\n")
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    # Make skipfile entries impossible to miss; they hide real test cases
+    skipped = sorted(config.stash[_SKIPFILE_ENTRIES])
+    recorded = sorted(_read_skipfile() - config.stash[_SKIPFILE_ENTRIES])
+    if not (skipped or recorded):
+        return
+    terminalreporter.section("skipfile", yellow=True, bold=True)
+    for nodeid in skipped:
+        terminalreporter.line(f"SKIPPED (timed out earlier) {nodeid}", yellow=True)
+    for nodeid in recorded:
+        terminalreporter.line(f"RECORDED (timed out now)   {nodeid}", red=True)
+    terminalreporter.line(f"Delete lines from {SKIPFILE} to run these tests again")
+
+
+# Canned API payloads; tests must not mutate them (copy first if a test diverges)
+WALLET = {
+    "id": "wallet_123",
+    "publicKey": "pub_key_abc",
+    "address": "1A1zP1eP5QGefi2DMPTfTL5SLmv7DivfNa",
+    "createdAt": "2026-02-14T12:00:00Z",
+    "balance": 100000,
+    "balanceMnee": 5000
+}
+
+SERVICE = {
+    "id": "service_456",
+    "agentId": "wallet_123",
+    "name": "TextAnalyzer",
+    "description": "NLP service",
+    "category": "nlp",
+    "price": 1000,
+    "currency": "BSV",
+    "endpoint": "https://agent.com/analyze",
+    "method": "POST",
+    "active": True,
+    "timeout": 30,
+    "disputeWindow": 30,
+    "createdAt": "2026-02-14T12:00:00Z",
+    "updatedAt": "2026-02-14T12:00:00Z"
+}
+
+EXECUTION = {
+    "paymentId": "payment_789",
+    "serviceId": "service_456",
+    "output": {
+        "result": "success",
+        "data": "analyzed"
+    },
+    "executionTimeMs": 250,
+    "status": "success"
+}
+
+
+class FakeResp:
+    """Minimal stand-in for requests.Response; far cheaper to build than a Mock"""
+
+    __slots__ = ("_json", "content", "status_code", "ok", "raw")
+
+    def __init__(self, payload=None, status_code=200, content=None, raw=None):
+        self._json = payload
+        self.content = json.dumps(payload).encode() if content is None else content
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.raw = raw
+
+    def json(self):
+        return self._json
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise requests.HTTPError(f"{self.status_code} Error", response=self)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture(scope="module")
+def wallet_response_mock():
+    """Response carrying WALLET, built once per module"""
+    return FakeResp({"wallet": WALLET})
+
+
+@pytest.fixture(scope="module")
+def service_response_mock():
+    """Response carrying SERVICE, built once per module"""
+    return FakeResp({"service": SERVICE})
+
+
+@pytest.fixture(scope="module")
+def search_response_mock():
+    """Search response listing SERVICE, built once per module"""
+    return FakeResp({"services": [SERVICE]})
+
+
+@pytest.fixture(scope="module")
+def execution_response_mock():
+    """Execution response carrying EXECUTION, built once per module"""
+    return FakeResp(EXECUTION)
+
+
+class MockRouter:
+    """Stand-ins for the requests.Session verbs, configured per test like any Mock"""
+
+    VERBS = ("get", "post", "put", "patch", "delete")
+
+    def __init__(self, monkeypatch):
+        for verb in self.VERBS:
+            mock = Mock(name=f"Session.{verb}")
+            monkeypatch.setattr(requests.Session, verb, mock)
+            setattr(self, verb, mock)
+
+
+@pytest.fixture(autouse=True)
+def http(monkeypatch):
+    """Route every Session request to a fresh MockRouter; no test hits the network"""
+    return MockRouter(monkeypatch)
+
+
+@pytest.fixture(scope="session")
+def _shared_client():
+    client = AgentPayClient()
+    yield client
+    client.close()
+
+
+@pytest.fixture
+def client(_shared_client):
+    """One AgentPayClient for the whole run, with no state carried between tests
+
+    The response cache is emptied and the operation modules (cached
+    properties holding miss caches, the webhook cache and route fallbacks)
+    are dropped, so each test rebuilds them on the shared session.
+    """
+    _shared_client._cache.clear()
+    for name, attr in vars(AgentPayClient).items():
+        if isinstance(attr, cached_property):
+            _shared_client.__dict__.pop(name, None)
+    return _shared_client
@@ -1,9 +1,121 @@
 """Tests for AgentPay SDK"""
 
+import asyncio
+import io
+import json
 import pytest
-from unittest.mock import Mock, patch
-from agentspay import AgentPayClient
-from agentspay.exceptions import WalletError, ServiceError, ExecutionError
+import requests
+import subprocess
+import sys
+from unittest.mock import patch
+from agentspay import AgentPayClient, ExecutionRequest
+from agentspay.exceptions import (
+    WalletError, ServiceError, ExecutionError, WebhookError, BatchExecutionError
+)
+from conftest import EXECUTION, FakeResp, WALLET
+
+
+# Canned API payloads shared by read-only tests; vary fields via {**CONST, ...}
+SERVICE_STUB = {
+    "id": "service_1",
+    "agentId": "wallet_1",
+    "name": "Service 1",
+    "description": "Test service",
+    "category": "nlp",
+    "price": 500,
+    "currency": "BSV",
+    "endpoint": "https://agent.com/1",
+    "method": "POST",
+    "active": True,
+    "createdAt": "2026-02-14T12:00:00Z",
+    "updatedAt": "2026-02-14T12:00:00Z"
+}
+
+WEBHOOK_STUB = {
+    "id": "webhook_1",
+    "url": "https://example.com/hook",
+    "events": ["payment.completed"],
+    "active": True,
+    "createdAt": "2026-02-14T12:00:00Z"
+}
+
+REPUTATION_RESPONSE = {
+    "reputation": {
+        "agentId": "wallet_1",
+        "totalJobs": 10,
+        "successRate": 0.9,
+        "avgResponseTimeMs": 120,
+        "totalEarned": 5000,
+        "totalSpent": 0,
+        "rating": 4.5
+    }
+}
+
+
+EXECUTE_INPUT = {"text": "Test"}
+EXECUTE_ARGS = ("service_456", "wallet_123", EXECUTE_INPUT)
+
+SEARCH_KWARGS = {"keyword": "nlp", "max_price": 1000}
+
+REGISTER_SERVICE_KWARGS = {
+    "agent_id": "wallet_123",
+    "name": "TextAnalyzer",
+    "description": "NLP service",
+    "price": 1000,
+    "currency": "BSV",
+    "endpoint": "https://agent.com/analyze",
+    "category": "nlp"
+}
+
+# verb, client method, args, kwargs, response fixture, expected attributes
+HAPPY_PATH_CASES = [
+    pytest.param(
+        "post", "create_wallet", (), {}, "wallet_response_mock",
+        {
+            "id": "wallet_123",
+            "public_key": "pub_key_abc",
+            "address": "1A1zP1eP5QGefi2DMPTfTL5SLmv7DivfNa",
+            "balance": 100000,
+            "balance_mnee": 5000
+        },
+        id="create_wallet"
+    ),
+    pytest.param(
+        "get", "get_wallet", ("wallet_123",), {}, "wallet_response_mock",
+        {"id": "wallet_123", "balance": 100000},
+        id="get_wallet"
+    ),
+    pytest.param(
+        "post", "register_service", (),
+        REGISTER_SERVICE_KWARGS, "service_response_mock",
+        {
+            "id": "service_456",
+            "name": "TextAnalyzer",
+            "price": 1000,
+            "currency": "BSV",
+            "active": True
+        },
+        id="register_service"
+    ),
+    pytest.param(
+        "get", "search_services", (), SEARCH_KWARGS,
+        "search_response_mock",
+        {"id": "service_456", "category": "nlp"},
+        id="search_services", marks=pytest.mark.timeout(2)
+    ),
+    pytest.param(
+        "post", "execute", EXECUTE_ARGS, {},
+        "execution_response_mock",
+        {
+            "payment_id": "payment_789",
+            "service_id": "service_456",
+            "status": "success",
+            "execution_time_ms": 250,
+            "output": {"result": "success", "data": "analyzed"}
+        },
+        id="execute", marks=pytest.mark.timeout(2)
+    ),
+]
 
 
 class TestAgentPayClient:
@@ -21,200 +133,670 @@ class TestAgentPayClient:
         )
         assert client_with_key.base_url == "https://api.agentspay.io"
         assert client_with_key.api_key == "test-key"
+        assert client_with_key._session.headers["Authorization"] == "Bearer test-key"
     
-    @patch('agentspay.wallet.requests.post')
-    def test_create_wallet(self, mock_post):
-        """Test wallet creation"""
-        # Mock API response
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            "wallet": {
-                "id": "wallet_123",
-                "publicKey": "pub_key_abc",
-                "address": "1A1zP1eP5QGefi2DMPTfTL5SLmv7DivfNa",
-                "createdAt": "2026-02-14T12:00:00Z",
-                "balance": 100000,
-                "balanceMnee": 5000
-            }
-        }
-        mock_response.raise_for_status = Mock()
-        mock_post.return_value = mock_response
+    def test_package_import_is_lazy(self):
+        """Test importing types and exceptions does not pull in requests"""
+        code = "import sys; from agentspay import WalletError; print('requests' in sys.modules)"
+        out = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        assert out.stdout.strip() == "False"
+    
+    def test_star_import_without_httpx(self):
+        """Test star-import works for sync-only installs and the async client hints at the extra"""
+        code = (
+            "import sys; sys.modules['httpx'] = None\n"
+            "from agentspay import *\n"
+            "assert 'AsyncAgentPayClient' not in dir()\n"
+            "try:\n"
+            "    from agentspay import AsyncAgentPayClient\n"
+            "except ImportError as e:\n"
+            "    print(e)\n"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        assert "pip install agentspay[async]" in out.stdout
+    
+    def test_client_shares_session(self):
+        """Test all operation modules reuse the client's session"""
+        with AgentPayClient() as client:
+            assert client._wallet.session is client._session
+            assert client._services.session is client._session
+            assert client._payments.session is client._session
+            assert client._disputes.session is client._session
+            assert client._webhooks.session is client._session
+    
+    @patch('socket.getaddrinfo')
+    def test_cache_dns(self, mock_getaddrinfo):
+        """Test cache_dns resolves the API host once and reuses the address"""
+        from agentspay import _dns
+        mock_getaddrinfo.return_value = [(2, 1, 6, "", ("10.0.0.7", 443))]
+        _dns._DNS_CACHE.clear()
         
-        # Test
-        client = AgentPayClient()
-        wallet = client.create_wallet()
-        
-        assert wallet.id == "wallet_123"
-        assert wallet.public_key == "pub_key_abc"
-        assert wallet.address == "1A1zP1eP5QGefi2DMPTfTL5SLmv7DivfNa"
-        assert wallet.balance == 100000
-        assert wallet.balance_mnee == 5000
-    
-    @patch('agentspay.wallet.requests.get')
-    def test_get_wallet(self, mock_get):
-        """Test getting wallet by ID"""
-        # Mock API response
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            "wallet": {
-                "id": "wallet_123",
-                "publicKey": "pub_key_abc",
-                "address": "1A1zP1eP5QGefi2DMPTfTL5SLmv7DivfNa",
-                "createdAt": "2026-02-14T12:00:00Z",
-                "balance": 50000
-            }
-        }
-        mock_response.raise_for_status = Mock()
-        mock_get.return_value = mock_response
+        with AgentPayClient(base_url="https://api.example.test", cache_dns=True) as client:
+            pools = client._session.get_adapter("https://").poolmanager.pool_classes_by_scheme
+            assert pools["https"] is _dns._CachedDNSHTTPSPool
+            client._executor.shutdown(wait=True)
+            assert _dns.resolve("api.example.test", 443) == "10.0.0.7"
+            assert mock_getaddrinfo.call_count == 1
+        with pytest.raises(ValueError):
+            AgentPayClient(cache_dns=True, http2=True)
+    
+    def test_retry_policy(self):
+        """Test 429s are retried for every method but 5xx only for idempotent ones"""
+        with AgentPayClient(max_retries=5) as client:
+            retry = client._session.get_adapter("https://").max_retries
+            assert retry.total == 5
+            assert retry.is_retry("POST", 429)
+            assert not retry.is_retry("POST", 503)
+            assert retry.is_retry("GET", 503)
+            assert type(retry.new(total=1)) is type(retry)
+    
+    def test_set_api_key(self):
+        """Test rotating the API key updates the shared session in place"""
+        with AgentPayClient(api_key="old-key") as client:
+            session = client._session
+            client._cache.set(("wallet", "wallet_123"), object())
+            
+            client._webhooks._misses.set("webhook_1", True)
+            client._services._misses.set("service_1", True)
+            
+            client.set_api_key("new-key")
+            assert client._session is session
+            assert len(client._webhooks._misses) == 0
+            assert len(client._services._misses) == 0
+            assert session.headers["Authorization"] == "Bearer new-key"
+            assert client._wallet.api_key == "new-key"
+            assert len(client._cache) == 0
+            
+            client.set_api_key(None)
+            assert "Authorization" not in session.headers
+    
+    def test_max_pool_size(self):
+        """Test the pool size and TCP keepalive reach both mounted adapters"""
+        import socket
+        with AgentPayClient(max_pool_size=64) as client:
+            for prefix in ("http://", "https://"):
+                adapter = client._session.get_adapter(prefix)
+                assert adapter._pool_maxsize == 64
+                options = adapter.poolmanager.connection_pool_kw["socket_options"]
+                assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in options
+    
+    def test_http_cache_adapter(self):
+        """Test http_cache mounts hishel's caching adapter"""
+        pytest.importorskip("hishel")
+        from hishel.requests import CacheAdapter
         
-        # Test
-        client = AgentPayClient()
-        wallet = client.get_wallet("wallet_123")
-        
-        assert wallet.id == "wallet_123"
-        assert wallet.balance == 50000
-    
-    @patch('agentspay.services.requests.post')
-    def test_register_service(self, mock_post):
-        """Test service registration"""
-        # Mock API response
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            "service": {
-                "id": "service_456",
-                "agentId": "wallet_123",
-                "name": "TextAnalyzer",
-                "description": "NLP service",
-                "category": "nlp",
-                "price": 1000,
-                "currency": "BSV",
-                "endpoint": "https://agent.com/analyze",
-                "method": "POST",
-                "active": True,
-                "timeout": 30,
-                "disputeWindow": 30,
-                "createdAt": "2026-02-14T12:00:00Z",
-                "updatedAt": "2026-02-14T12:00:00Z"
-            }
-        }
-        mock_response.raise_for_status = Mock()
-        mock_post.return_value = mock_response
+        with AgentPayClient(http_cache=True) as client:
+            adapter = client._session.get_adapter("https://")
+            assert isinstance(adapter, CacheAdapter)
+            assert adapter._pool_maxsize == 32
+        with pytest.raises(ValueError):
+            AgentPayClient(http_cache=True, http2=True)
+
+    def test_http_cache_revalidation(self, http):
+        """Test repeat GETs through the cache are served from a 304 revalidation"""
+        pytest.importorskip("hishel")
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        body = json.dumps({"services": [SERVICE_STUB]}).encode()
+        conditional = []
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                conditional.append(self.headers.get("If-None-Match"))
+                if self.headers.get("If-None-Match") == 'W/"v1"':
+                    # Express-style 304 that carries a zero Content-Length
+                    self.send_response(304)
+                    self.send_header("ETag", 'W/"v1"')
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("ETag", 'W/"v1"')
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            with AgentPayClient(
+                base_url=f"http://127.0.0.1:{server.server_port}", http_cache=True, cache_ttl=0
+            ) as client:
+                http.get.side_effect = lambda url, **kw: client._session.request("GET", url, **kw)
+
+                assert client.search_services()[0].id == "service_1"
+                assert client.search_services()[0].id == "service_1"
+                assert conditional == [None, 'W/"v1"']
+
+                # Pool threads share the cache storage
+                with ThreadPoolExecutor(8) as pool:
+                    found = list(pool.map(lambda _: client.search_services(), range(32)))
+                assert all(services[0].id == "service_1" for services in found)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    @pytest.mark.parametrize("verb,method,args,kwargs,response,expected", HAPPY_PATH_CASES)
+    def test_client_happy_path(
+        self, http, client, request, verb, method, args, kwargs, response, expected
+    ):
+        """Test each client call parses its canned API response"""
+        getattr(http, verb).return_value = request.getfixturevalue(response)
         
-        # Test
-        client = AgentPayClient()
-        service = client.register_service(
-            agent_id="wallet_123",
-            name="TextAnalyzer",
-            description="NLP service",
-            price=1000,
-            currency="BSV",
-            endpoint="https://agent.com/analyze",
-            category="nlp"
+        result = getattr(client, method)(*args, **kwargs)
+        if isinstance(result, list):
+            assert len(result) == 1
+            result = result[0]
+        
+        for attr, value in expected.items():
+            assert getattr(result, attr) == value
+        assert getattr(http, verb).call_count == 1
+    
+    def test_get_balance_uses_cached_wallet(self, http, client):
+        """Test repeated balance lookups hit the cache until an execution invalidates it"""
+        http.get.return_value = FakeResp(
+            {"wallet": {**WALLET, "balance": 50000, "balanceMnee": 700}}
         )
+        http.post.return_value = FakeResp(EXECUTION)
         
-        assert service.id == "service_456"
-        assert service.name == "TextAnalyzer"
-        assert service.price == 1000
-        assert service.currency == "BSV"
-        assert service.active is True
-    
-    @patch('agentspay.services.requests.get')
-    def test_search_services(self, mock_get):
-        """Test searching for services"""
-        # Mock API response
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            "services": [
-                {
-                    "id": "service_1",
-                    "agentId": "wallet_1",
-                    "name": "Service 1",
-                    "description": "Test service",
-                    "category": "nlp",
-                    "price": 500,
-                    "currency": "BSV",
-                    "endpoint": "https://agent.com/1",
-                    "method": "POST",
-                    "active": True,
-                    "timeout": 30,
-                    "disputeWindow": 30,
-                    "createdAt": "2026-02-14T12:00:00Z",
-                    "updatedAt": "2026-02-14T12:00:00Z"
-                }
-            ]
-        }
-        mock_response.raise_for_status = Mock()
-        mock_get.return_value = mock_response
+        assert client.get_balance("wallet_123") == 50000
+        assert client.get_balance("wallet_123", currency="MNEE") == 700
+        assert client.get_balances("wallet_123") == {"BSV": 50000, "MNEE": 700}
+        assert http.get.call_count == 1
+        with pytest.raises(WalletError):
+            client.get_balance("wallet_123", currency="ETH")
         
-        # Test
-        client = AgentPayClient()
-        services = client.search_services(keyword="nlp", max_price=1000)
-        
-        assert len(services) == 1
-        assert services[0].id == "service_1"
-        assert services[0].category == "nlp"
-    
-    @patch('agentspay.payments.requests.post')
-    def test_execute_service(self, mock_post):
-        """Test service execution"""
-        # Mock API response
-        mock_response = Mock()
-        mock_response.json.return_value = {
+        client.execute(*EXECUTE_ARGS)
+        client.get_balance("wallet_123")
+        assert http.get.call_count == 2
+    
+    def test_register_service_body(self, http, client, service_response_mock):
+        """Test registration sends the service as pre-serialized JSON"""
+        http.post.return_value = service_response_mock
+        
+        client.register_service(**REGISTER_SERVICE_KWARGS)
+        
+        # Body is pre-serialized bytes; Content-Type comes from the session
+        body = json.loads(http.post.call_args.kwargs["data"])
+        assert body["agentId"] == "wallet_123"
+        assert body["price"] == 1000
+    
+    def test_iter_search_services(self, http, client):
+        """Test streamed search parses services incrementally from the raw body"""
+        pytest.importorskip("ijson")
+        body = {"services": [
+            {**SERVICE_STUB, "id": f"service_{i}", "price": 1000 + i} for i in range(3)
+        ]}
+        # No eager body: only the raw stream can yield these services
+        http.get.return_value = FakeResp(
+            body, content=b"", raw=io.BytesIO(json.dumps(body).encode())
+        )
+        
+        services = client.iter_search_services(keyword="nlp", limit=3)
+        first = next(services)
+        
+        assert first.id == "service_0"
+        assert http.get.call_args.kwargs["stream"] is True
+        assert http.get.call_args.kwargs["params"] == {"q": "nlp", "limit": "3"}
+        assert [s.price for s in services] == [1001, 1002]
+    
+    def test_search_all_services(self, http, client):
+        """Test paginated search (eager and streamed) stops at the first short page and dedupes"""
+        catalog = [f"service_{i}" for i in range(23)]
+        
+        def respond(url, params=None, **kwargs):
+            offset = int(params.get("offset", 0))
+            limit = int(params["limit"])
+            ids = catalog[offset:offset + limit]
+            if offset == 10:
+                # A page overlapping an earlier one, as if the catalog shifted mid-scan
+                ids = ids[:-1] + ["service_4"]
+            return FakeResp({
+                "services": [
+                    {**SERVICE_STUB, "id": service_id, "name": service_id} for service_id in ids
+                ]
+            })
+        http.get.side_effect = respond
+        
+        services = client.search_all_services(keyword="nlp", page_size=5, max_concurrency=2)
+        
+        assert [s.id for s in services] == [i for i in catalog if i != "service_14"]
+        assert http.get.call_count == 5
+        
+        streamed = client.iter_all_services(keyword="nlp", page_size=5)
+        assert [s.id for s in streamed] == [s.id for s in services]
+        assert http.get.call_count == 10
+    
+    def test_search_services_prefetch(self, http):
+        """Test prefetching caches search hits and warms provider reputations"""
+        def respond(url, **kwargs):
+            if url.endswith("/reputation"):
+                return FakeResp(REPUTATION_RESPONSE)
+            return FakeResp({"services": [SERVICE_STUB]})
+        http.get.side_effect = respond
+        
+        with AgentPayClient() as client:
+            services = client.search_services(keyword="nlp", prefetch=True)
+            client._executor.shutdown(wait=True)
+            
+            assert client.get_service("service_1") is services[0]
+            assert client.get_reputation("wallet_1").rating == 4.5
+            assert http.get.call_count == 2
+    
+    def test_execute_parses_payment_and_receipt(self, http, client):
+        """Test payment and receipt fields land on the right attributes"""
+        http.post.return_value = FakeResp({
             "paymentId": "payment_789",
             "serviceId": "service_456",
-            "output": {
-                "result": "success",
-                "data": "analyzed"
+            "output": {},
+            "payment": {
+                "id": "payment_789",
+                "serviceId": "service_456",
+                "buyerWalletId": "wallet_123",
+                "sellerWalletId": "wallet_456",
+                "amount": 1000,
+                "platformFee": 20,
+                "currency": "BSV",
+                "status": "escrowed",
+                "createdAt": "2026-02-14T12:00:00Z",
+                "txId": "tx_abc"
             },
-            "executionTimeMs": 250,
-            "status": "success"
-        }
-        mock_response.raise_for_status = Mock()
-        mock_post.return_value = mock_response
+            "receipt": {
+                "id": "receipt_1",
+                "paymentId": "payment_789",
+                "serviceId": "service_456",
+                "inputHash": "in_hash",
+                "outputHash": "out_hash",
+                "timestamp": 1771070400000,
+                "executionTimeMs": 250,
+                "providerSignature": "provider_sig",
+                "platformSignature": "platform_sig",
+                "receiptHash": "receipt_hash",
+                "blockchainTxId": "anchor_tx"
+            }
+        })
         
-        # Test
-        client = AgentPayClient()
-        result = client.execute(
-            service_id="service_456",
-            buyer_wallet_id="wallet_123",
-            input_data={"text": "Test"}
-        )
+        result = client.execute(*EXECUTE_ARGS)
+        
+        assert result.payment.seller_wallet_id == "wallet_456"
+        assert result.payment.platform_fee == 20
+        assert result.payment.dispute_status is None
+        assert result.payment.tx_id == "tx_abc"
+        assert result.receipt.output_hash == "out_hash"
+        assert result.receipt.platform_signature == "platform_sig"
+        assert result.receipt.receipt_hash == "receipt_hash"
+        assert result.receipt.blockchain_tx_id == "anchor_tx"
+        assert result.receipt.blockchain_anchored_at is None
+    
+    @pytest.mark.parametrize("input_data", [
+        pytest.param({"x": float("nan")}, id="nan"),
+        pytest.param({"x": [None, {"y": float("-inf")}]}, id="nested-inf"),
+        pytest.param({"x": object()}, id="unserializable"),
+    ])
+    def test_execute_rejects_unserializable_input(self, http, client, input_data):
+        """Test bad request bodies raise ExecutionError instead of being sent"""
+        with pytest.raises(ExecutionError, match="serialize"):
+            client.execute("service_456", "wallet_123", input_data)
+        http.post.assert_not_called()
+    
+    def test_execute_sends_big_integers(self, http, client, execution_response_mock):
+        """Test integers beyond 64 bits are serialized like requests' json= did"""
+        http.post.return_value = execution_response_mock
+        
+        client.execute("service_456", "wallet_123", {"n": 2 ** 70})
+        assert json.loads(http.post.call_args.kwargs["data"])["input"] == {"n": 2 ** 70}
+    
+    def test_json_dumps_keeps_nulls_on_orjson(self):
+        """Test bodies holding None are still encoded by orjson, not the stdlib"""
+        orjson = pytest.importorskip("orjson")
+        from agentspay._http import json_dumps
+        
+        body = {"x": None, "note": "null", "n": 1.5}
+        assert json_dumps(body) == orjson.dumps(body)
+    
+    def test_execute_service_bench(self, http, client, benchmark, execution_response_mock):
+        """Benchmark client.execute alone; response wiring happens before timing starts"""
+        http.post.return_value = execution_response_mock
+        
+        result = benchmark(client.execute, *EXECUTE_ARGS)
         
         assert result.payment_id == "payment_789"
-        assert result.service_id == "service_456"
-        assert result.status == "success"
-        assert result.execution_time_ms == 250
-        assert result.output["result"] == "success"
-
-
-class TestExceptions:
-    """Test SDK exceptions"""
     
-    @patch('agentspay.wallet.requests.post')
-    def test_wallet_error(self, mock_post):
-        """Test WalletError is raised on API failure"""
-        mock_post.side_effect = Exception("Network error")
+    def test_canonical_json_formats_numbers_like_js(self):
+        """Test floats are written as Node's JSON.stringify writes them"""
+        from agentspay.verify import canonical_json
+        data = {"score": 0.000032, "tiny": 1e-7, "int": 2.0, "big": 1e21, "e20": 1e20,
+                "neg": -0.0000015, "lst": [0.1, 1e-6, 100]}
+        
+        # Output of JSON.stringify(data, Object.keys(data).sort()) in node
+        assert canonical_json(data) == (
+            b'{"big":1e+21,"e20":100000000000000000000,"int":2,"lst":[0.1,0.000001,100],'
+            b'"neg":-0.0000015,"score":0.000032,"tiny":1e-7}'
+        )
+    
+    def test_verify_receipt(self, client):
+        """Test receipts are verified locally against server-computed hashes"""
+        from agentspay.payments import _parse_receipt
+        
+        # Hashes produced by the API's VerificationManager
+        receipt = _parse_receipt({
+            "id": "receipt_1",
+            "paymentId": "payment_123",
+            "serviceId": "service_123",
+            "inputHash": "3bf8ef65624515cba779e8880f1c6e89ef75b537fc17abcfac9c0d4bcdc28b7a",
+            "outputHash": "fdd5dae63ad52cd23f54b6002dcf95325df8a679e83e21d28377b5781f23568f",
+            "timestamp": 1700000000000,
+            "executionTimeMs": 42,
+            "providerSignature": "ps",
+            "platformSignature": "pl",
+            "receiptHash": "16116e814c01fd86aa0840cd47cd3254083113d4b1b621c28fbc348485a8c22f"
+        })
+        input_data = {"text": "h\u00e9llo", "opts": {"lang": "en", "text": "x"}}
+        output_data = {"score": 0.5, "labels": ["a", "b"]}
+        
+        assert client.verify_receipt(receipt, input_data, output_data)
+        assert client.verify_receipt(receipt)
+        assert not client.verify_receipt(receipt, {"text": "tampered"})
+        
+        receipt.execution_time_ms = 43
+        assert not client.verify_receipt(receipt)
+    
+    def test_execute_many(self, http, client):
+        """Test batched execution returns results in request order"""
+        def respond(url, **kwargs):
+            service_id = url.rsplit("/", 1)[-1]
+            mock_response = FakeResp({
+                "paymentId": f"payment_{service_id}",
+                "serviceId": service_id,
+                "output": json.loads(kwargs["data"])["input"],
+                "executionTimeMs": 10,
+                "status": "success"
+            })
+            return mock_response
+        http.post.side_effect = respond
+        
+        results = client.execute_many([
+            ExecutionRequest(
+                service_id=f"service_{i}", buyer_wallet_id="wallet_123", input={"n": i}
+            )
+            for i in range(5)
+        ], max_concurrency=3)
+        
+        assert [r.service_id for r in results] == [f"service_{i}" for i in range(5)]
+        assert [r.output["n"] for r in results] == list(range(5))
+        assert http.post.call_count == 5
+    
+    def test_execute_many_partial_failure(self, http):
+        """Test a failed execution does not hide the ones that were charged"""
+        def respond(url, **kwargs):
+            service_id = url.rsplit("/", 1)[-1]
+            if service_id == "service_1":
+                raise requests.ConnectionError("boom")
+            return FakeResp({**EXECUTION, "paymentId": f"payment_{service_id}"})
+        http.post.side_effect = respond
+        http.get.return_value = FakeResp({"wallet": WALLET})
         
         client = AgentPayClient()
-        with pytest.raises(WalletError):
-            client.create_wallet()
+        client.get_wallet("wallet_123")
+        with pytest.raises(BatchExecutionError) as excinfo:
+            client.execute_many([
+                ExecutionRequest(service_id=f"service_{i}", buyer_wallet_id="wallet_123", input={})
+                for i in range(4)
+            ])
+        
+        results = excinfo.value.results
+        assert isinstance(results[1], ExecutionError)
+        assert [r.payment_id for r in excinfo.value.succeeded] == [
+            "payment_service_0", "payment_service_2", "payment_service_3"
+        ]
+        assert http.post.call_count == 4
+        
+        # The buyer's balance moved, so the cached wallet must not be served
+        client.get_wallet("wallet_123")
+        assert http.get.call_count == 2
     
-    @patch('agentspay.services.requests.post')
-    def test_service_error(self, mock_post):
-        """Test ServiceError is raised on API failure"""
-        mock_post.side_effect = Exception("API error")
+    def test_get_webhook_uses_listed_webhooks(self, http):
+        """Test webhooks returned by list_webhooks are served from the cache"""
+        http.get.return_value = FakeResp({"webhooks": [WEBHOOK_STUB]})
+        http.delete.return_value = FakeResp()
         
         client = AgentPayClient()
-        with pytest.raises(ServiceError):
-            client.register_service(
-                agent_id="wallet_123",
-                name="Test",
-                description="Test",
-                price=100,
-                currency="BSV",
-                endpoint="https://test.com",
-                category="test"
+        client.list_webhooks()
+        assert client.get_webhook("webhook_1").url == "https://example.com/hook"
+        assert http.get.call_count == 1
+        
+        client.delete_webhook("webhook_1")
+        with pytest.raises(WebhookError):
+            client.get_webhook("webhook_1")
+        assert http.get.call_count == 2
+    
+    def test_get_service_caches_misses(self, http):
+        """Test a 404'd service ID is not re-requested while the miss is fresh"""
+        http.get.return_value = FakeResp(status_code=404, content=b'{"error": "Service not found"}')
+        
+        client = AgentPayClient(cache_ttl=0)
+        for _ in range(3):
+            with pytest.raises(ServiceError, match="not found"):
+                client.get_service("service_missing")
+        assert http.get.call_count == 1
+    
+    def test_get_webhook_falls_back_to_list_once(self, http):
+        """Test get_webhook scans the list when the API has no by-ID route"""
+        def webhook(webhook_id):
+            return {**WEBHOOK_STUB, "id": webhook_id, "url": f"https://example.com/{webhook_id}"}
+        
+        def respond(url, **kwargs):
+            if url.endswith("/api/webhooks"):
+                return FakeResp({"webhooks": [webhook("webhook_1"), webhook("webhook_2")]})
+            return FakeResp(status_code=404, content=b"<pre>Cannot GET</pre>")
+        http.get.side_effect = respond
+        
+        client = AgentPayClient(cache_ttl=0)
+        assert client.get_webhook("webhook_2").url == "https://example.com/webhook_2"
+        assert http.get.call_count == 2
+        
+        with pytest.raises(WebhookError):
+            client.get_webhook("webhook_3")
+        assert http.get.call_count == 3
+        assert http.get.call_args.args[0].endswith("/api/webhooks")
+    
+    def test_get_payment_disputes_filters_client_side(self, http, client):
+        """Test payment disputes are filtered even when the API ignores ?paymentId="""
+        def dispute(dispute_id, payment_id):
+            return {
+                "id": dispute_id,
+                "paymentId": payment_id,
+                "buyerWalletId": "wallet_1",
+                "providerWalletId": "wallet_2",
+                "reason": "Bad output",
+                "status": "open",
+                "createdAt": "2026-02-14T12:00:00Z"
+            }
+        
+        # An older API returns every dispute of the wallet
+        http.get.return_value = FakeResp({
+            "disputes": [dispute("d1", "payment_1"), dispute("d2", "payment_2")]
+        })
+        
+        disputes = client.get_payment_disputes("payment_2")
+        assert [d.id for d in disputes] == ["d2"]
+        assert http.get.call_args.kwargs["params"] == {"paymentId": "payment_2"}
+        assert http.get.call_count == 1
+    
+    def test_http2_pool_size(self):
+        """Test max_pool_size reaches the HTTP/2 transport's connection pool"""
+        pytest.importorskip("httpx")
+        pytest.importorskip("h2")
+        
+        with AgentPayClient(http2=True, max_pool_size=7) as client:
+            pool = client._session._client._transport._pool
+            assert pool._max_keepalive_connections == 7
+            assert pool._http2
+    
+    def test_http2_session(self):
+        """Test the httpx-backed session behaves like a requests session"""
+        httpx = pytest.importorskip("httpx")
+        pytest.importorskip("h2")
+        
+        def handler(request):
+            assert request.headers["Authorization"] == "Bearer test-key"
+            if request.url.path.endswith("/missing"):
+                return httpx.Response(404, json={"error": "Wallet not found"})
+            return httpx.Response(200, json={
+                "wallet": {
+                    "id": "wallet_123",
+                    "publicKey": "pub_key_abc",
+                    "address": "1A1zP1eP5QGefi2DMPTfTL5SLmv7DivfNa",
+                    "createdAt": "2026-02-14T12:00:00Z"
+                }
+            })
+        
+        with AgentPayClient(api_key="test-key", http2=True) as client:
+            session = client._session
+            session._client.close()
+            session._client = httpx.Client(
+                headers=session.headers,
+                transport=httpx.MockTransport(handler)
             )
+            
+            assert client.get_wallet("wallet_123").public_key == "pub_key_abc"
+            with pytest.raises(WalletError):
+                client.get_wallet("missing")
+
+    def test_http2_status_retries(self):
+        """Test the HTTP/2 session retries 429s and idempotent 5xx like requests"""
+        httpx = pytest.importorskip("httpx")
+        pytest.importorskip("h2")
+
+        replies = []
+
+        def handler(request):
+            status, headers = replies.pop(0)
+            return httpx.Response(status, headers=headers, json=EXECUTION)
+
+        with AgentPayClient(http2=True) as client:
+            session = client._session
+            session._client.close()
+            session._client = httpx.Client(transport=httpx.MockTransport(handler))
+
+            with patch("agentspay._http.time.sleep") as sleep:
+                # A rate-limited POST never ran, so it is replayed after Retry-After
+                replies[:] = [(429, {"Retry-After": "1"}), (200, {})]
+                assert client.execute("service_456", "wallet_1", {}).status == "success"
+                assert sleep.call_args_list == [((1,),)]
+
+                # A 5xx POST may have run; only GETs are retried
+                replies[:] = [(503, {}), (200, {})]
+                with pytest.raises(ExecutionError):
+                    client.execute("service_456", "wallet_1", {})
+                replies[:] = [(502, {}), (503, {}), (200, {})]
+                assert session.get("https://api.example/x").status_code == 200
+                assert not replies
+
+
+class TestAsyncAgentPayClient:
+    """Test suite for AsyncAgentPayClient"""
+    
+    def test_search_and_fetch(self):
+        """Test search hits are fetched concurrently and returned in order"""
+        httpx = pytest.importorskip("httpx")
+        from agentspay import AsyncAgentPayClient
+        
+        def service(service_id):
+            return {**SERVICE_STUB, "id": service_id, "name": service_id}
+        
+        def handler(request):
+            if request.url.path == "/api/services":
+                assert request.url.params["q"] == "nlp"
+                return httpx.Response(200, json={"services": [service("s1"), service("s2")]})
+            service_id = request.url.path.rsplit("/", 1)[-1]
+            return httpx.Response(200, json={"service": service(service_id)})
+        
+        async def run():
+            async with AsyncAgentPayClient(http2=False) as client:
+                await client._client.aclose()
+                client._client = httpx.AsyncClient(
+                    base_url=client.base_url,
+                    transport=httpx.MockTransport(handler)
+                )
+                return await client.search_and_fetch("nlp")
+        
+        services = asyncio.run(run())
+        
+        assert [s.id for s in services] == ["s1", "s2"]
+        assert services[0].timeout == 30
+    
+    def test_execution_timeout(self):
+        """Test the async client allows long executions like the sync HTTP/2 path"""
+        httpx = pytest.importorskip("httpx")
+        from agentspay import AsyncAgentPayClient
+        
+        async def run():
+            async with AsyncAgentPayClient(http2=False) as client:
+                return client._client.timeout
+        
+        timeout = asyncio.run(run())
+        assert timeout == httpx.Timeout(30.0, connect=5.0)
+    
+    def test_get_webhook_falls_back_to_list_once(self):
+        """Test async get_webhook scans the list when the API has no by-ID route"""
+        httpx = pytest.importorskip("httpx")
+        from agentspay import AsyncAgentPayClient
+        
+        paths = []
+        
+        def handler(request):
+            paths.append(request.url.path)
+            if request.url.path == "/api/webhooks":
+                return httpx.Response(200, json={"webhooks": [WEBHOOK_STUB]})
+            return httpx.Response(404, text="<pre>Cannot GET</pre>")
+        
+        async def run():
+            async with AsyncAgentPayClient(http2=False) as client:
+                await client._client.aclose()
+                client._client = httpx.AsyncClient(
+                    base_url=client.base_url,
+                    transport=httpx.MockTransport(handler)
+                )
+                webhook = await client.get_webhook("webhook_1")
+                with pytest.raises(WebhookError):
+                    await client.get_webhook("webhook_2")
+                return webhook
+        
+        webhook = asyncio.run(run())
+        
+        assert webhook.url == "https://example.com/hook"
+        assert paths == ["/api/webhooks/webhook_1", "/api/webhooks", "/api/webhooks"]
+
+
+class TestExceptions:
+    """Test SDK exceptions"""
+    
+    @pytest.mark.parametrize("method,args,kwargs,exc", [
+        pytest.param("create_wallet", (), {}, WalletError, id="wallet"),
+        pytest.param("register_service", (), REGISTER_SERVICE_KWARGS, ServiceError, id="service"),
+        pytest.param(
+            "execute", EXECUTE_ARGS, {}, ExecutionError, id="execution"
+        ),
+    ])
+    def test_transport_error(self, http, client, method, args, kwargs, exc):
+        """Test transport failures surface as the module's SDK error"""
+        http.post.side_effect = requests.ConnectionError("Network error")
+        
+        with pytest.raises(exc, match="Network error"):
+            getattr(client, method)(*args, **kwargs)
 
 
 if __name__ == "__main__":